@@ -1,31 +1,38 @@
 import os
 import sqlite3
 import asyncio
+import bisect
 import logging
+import queue
 import json
+import threading
 import time
 import base64
 import hmac
 import hashlib
+import heapq
 import contextlib
+import functools
 import re
 import html as html_lib
 import unicodedata
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal, ROUND_HALF_UP
 from email.utils import parseaddr
-from urllib import error as urllib_error
 from urllib import parse as urllib_parse
-from urllib import request as urllib_request
 from zoneinfo import ZoneInfo
 
+import httpx
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.constants import ParseMode
+from telegram.error import BadRequest
 from telegram.ext import (
+    AIORateLimiter,
     Application,
     CallbackQueryHandler,
     CommandHandler,
     ContextTypes,
+    Defaults,
     MessageHandler,
     filters,
 )
@@ -35,10 +42,30 @@ from telegram.ext import (
 # =========================
 
 DB_PATH = os.getenv("DB_PATH", "bot.db")
+DB_BUSY_TIMEOUT_MS = max(0, int(os.getenv("DB_BUSY_TIMEOUT_MS", "30000")))
+DB_POOL_SIZE = max(1, int(os.getenv("DB_POOL_SIZE", "4")))
+DB_MMAP_SIZE_BYTES = max(0, int(os.getenv("DB_MMAP_SIZE_BYTES", str(128 * 1024 * 1024))))
+DB_STATEMENT_CACHE_SIZE = max(16, int(os.getenv("DB_STATEMENT_CACHE_SIZE", "256")))
 BOT_TOKEN = os.getenv("BOT_TOKEN", "")
+WEBHOOK_URL = os.getenv("WEBHOOK_URL", "").strip().rstrip("/")  # optional; polling when empty
+WEBHOOK_LISTEN = os.getenv("WEBHOOK_LISTEN", "0.0.0.0").strip() or "0.0.0.0"
+# Webhook mode must run as the `web` process: only web dynos get $PORT and inbound HTTP.
+# Polling runs as `worker`; scale exactly one of the two.
+WEBHOOK_PORT = int(os.getenv("PORT", "8443"))
+WEBHOOK_SECRET_TOKEN = os.getenv("WEBHOOK_SECRET_TOKEN", "").strip() or None
 
 FEE_PCT = Decimal(os.getenv("FEE_PCT", "0.02"))  # 2% default
 NETWORK_FEE = Decimal(os.getenv("NETWORK_FEE", "0.30"))  # $0.30 flat
+_FEE_PCT_LABEL = f"{(FEE_PCT * 100):.0f}%"
+_DEC_ZERO = Decimal("0")
+_DEC_ONE = Decimal("1")
+_DEC_CENT = Decimal("0.01")
+_DEC_HUNDRED = Decimal(100)
+_DEC_QUANT_4 = Decimal("0.0001")
+_NETWORK_FEE_Q = NETWORK_FEE.quantize(_DEC_CENT, rounding=ROUND_HALF_UP)
+# Exact integer forms of the fee settings for cent arithmetic in compute_fee_net.
+_FEE_NUM, _FEE_DEN = FEE_PCT.as_integer_ratio()
+_NETWORK_FEE_CENTS = int((_NETWORK_FEE_Q * _DEC_HUNDRED).to_integral_value(rounding=ROUND_HALF_UP))
 BANNER_URL = os.getenv("BANNER_URL", "").strip()  # optional public image URL
 BANNER_PATH = os.getenv("BANNER_PATH", "").strip()  # optional local image path
 BANNER_FILE_ID = os.getenv("BANNER_FILE_ID", "").strip()  # optional Telegram file_id (fastest)
@@ -209,6 +236,12 @@ ADMIN_REVERSE_UI_LOOKBACK_HOURS = 24
 RELEASE_NOTIFY_DELETE_SECONDS = max(1, int(os.getenv("RELEASE_NOTIFY_DELETE_SECONDS", "86400")))
 RELEASE_ERROR_DELETE_SECONDS = max(1, int(os.getenv("RELEASE_ERROR_DELETE_SECONDS", "10")))
 BUTTON_SLOW_LOG_MS = max(100, int(os.getenv("BUTTON_SLOW_LOG_MS", "700")))
+BROADCAST_CONCURRENCY = max(1, int(os.getenv("BROADCAST_CONCURRENCY", "8")))
+# Outgoing Bot API throttle (Telegram: ~30 msg/s overall, ~20/min per group); 429s are retried.
+TELEGRAM_RATE_OVERALL_PER_SECOND = max(1, int(os.getenv("TELEGRAM_RATE_OVERALL_PER_SECOND", "28")))
+TELEGRAM_RATE_GROUP_PER_MINUTE = max(1, int(os.getenv("TELEGRAM_RATE_GROUP_PER_MINUTE", "18")))
+TELEGRAM_RATE_MAX_RETRIES = max(0, int(os.getenv("TELEGRAM_RATE_MAX_RETRIES", "3")))
+PANEL_REFRESH_DEBOUNCE_MS = max(0, int(os.getenv("PANEL_REFRESH_DEBOUNCE_MS", "350")))
 PANEL_RENDER_SLOW_LOG_MS = max(100, int(os.getenv("PANEL_RENDER_SLOW_LOG_MS", "500")))
 PANEL_RENDER_POLICY = (os.getenv("PANEL_RENDER_POLICY", "auto").strip().lower() or "auto")
 if PANEL_RENDER_POLICY not in {"auto", "text_only"}:
@@ -233,20 +266,59 @@ MAX_PARTICIPANTS = 2
 
 # Confirmation window (fixed 24h)
 CONFIRM_WINDOW_SECONDS = 24 * 60 * 60
+CONFIRM_CLEANUP_INTERVAL_SECONDS = max(10, int(os.getenv("CONFIRM_CLEANUP_INTERVAL_SECONDS", "300")))
 
-# Per-user "waiting for custom amount" state (in-memory OK for one worker)
-AWAITING_CUSTOM_AMOUNT: set[int] = set()
+# Per-user "waiting for custom amount" deadline (time.monotonic()), stored in PTB's context.user_data
+AWAITING_CUSTOM_AMOUNT_KEY = "awaiting_custom_amount"
+CUSTOM_AMOUNT_PROMPT_TIMEOUT_SECONDS = max(30, int(os.getenv("CUSTOM_AMOUNT_PROMPT_TIMEOUT_SECONDS", "300")))
 
 logger = logging.getLogger(__name__)
 
-# Serialize state-changing DB operations inside this single process.
+# Serialize total/session-changing DB operations inside this single process.
 STATE_LOCK = asyncio.Lock()
 KRAKEN_REFRESH_LOCK = asyncio.Lock()
 PANEL_RENDER_LOCKS: dict[int, asyncio.Lock] = {}
+# Caps concurrent per-participant Telegram calls in notify/panel broadcasts.
+BROADCAST_SEMAPHORE = asyncio.Semaphore(BROADCAST_CONCURRENCY)
+_DB_POOL: queue.SimpleQueue[sqlite3.Connection] = queue.SimpleQueue()
+_DB_READ_POOL: queue.SimpleQueue[sqlite3.Connection] = queue.SimpleQueue()
+_SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_KRAKEN_HTTP_CLIENT: httpx.Client | None = None
+# Guards the client plus the in-flight request count that shutdown waits on.
+_KRAKEN_HTTP_CLIENT_LOCK = threading.Lock()
+_KRAKEN_HTTP_IDLE = threading.Condition(_KRAKEN_HTTP_CLIENT_LOCK)
+_KRAKEN_HTTP_INFLIGHT = 0
+_KRAKEN_HTTP_CLOSING = False
+# Kraken requires each API key's nonces to *arrive* in increasing order, not just be
+# generated in order, so private calls hold this lock through the send as well.
+_KRAKEN_PRIVATE_LOCK = threading.Lock()
+_KRAKEN_LAST_NONCE = 0
+# Participant ids in join order; rows are only ever inserted, so invalidate on add.
+_PARTICIPANTS_CACHE: tuple[int, ...] | None = None
+_PARTICIPANT_ID_SET: frozenset[int] = frozenset()
+_PARTICIPANTS_CACHE_LOCK = threading.Lock()
+# (total_cents, session_id) mirror of the single global_state row; this process is the only writer.
+_GLOBAL_STATE_CACHE: tuple[int, int] | None = None
+# Sorted expires_at_ts of unconfirmed confirmations; the generation guards against
+# storing a snapshot read before a concurrent writer committed.
+_PENDING_EXPIRIES: tuple[int, ...] | None = None
+_PENDING_EXPIRIES_GEN = 0
+_PENDING_EXPIRIES_LOCK = threading.Lock()
+# Last (message_id, mode, text, keyboard) rendered per chat; identical edits are skipped.
+_LAST_PANEL_RENDER: dict[int, tuple[int, str, str, str]] = {}
+_LAST_SUBVIEW_RENDER: dict[int, tuple[int, str, str, str]] = {}
+# Write-through cache of chat_state rows; this process is the only writer.
+_CHAT_STATE_CACHE: dict[int, dict] = {}
 KRAKEN_REFRESH_TASK: asyncio.Task | None = None
 GMAIL_ZELLE_TASK: asyncio.Task | None = None
-_KRAKEN_DISPLAY_TZINFO = None
-_KRAKEN_DISPLAY_TZ_WARNED = False
+CONFIRM_CLEANUP_TASK: asyncio.Task | None = None
+DELETE_SWEEPER_TASK: asyncio.Task | None = None
+# Participants whose dashboard needs a refresh; one debounced task drains it.
+_PANEL_REFRESH_PENDING: set[int] = set()
+_PANEL_REFRESH_TASK: asyncio.Task | None = None
+# (monotonic deadline, chat_id, message_id) of scheduled deletions, drained by delete_sweeper_loop.
+_DELETE_HEAP: list[tuple[float, int, int]] = []
+_DELETE_WAKEUP = asyncio.Event()
 _KRAKEN_DEPOSIT_TIME_ANCHOR_INVALID_WARNED = False
 _KRAKEN_HOLD_ESTIMATE_OFFSET_WARNED = False
 _KRAKEN_LEDGER_HOLD_ESTIMATE_OFFSET_WARNED = False
@@ -315,14 +387,107 @@ HISTORY_PAGE_SIZE = 10
 # DB HELPERS
 # =========================
 
-def db() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
+# Hot statements shared by several helpers; one text each keeps them on a single cache entry.
+_SQL_SELECT_GLOBAL_STATE = "SELECT total_cents, session_id FROM global_state WHERE id = 1"
+_SQL_UPDATE_GLOBAL_TOTAL = "UPDATE global_state SET total_cents = ? WHERE id = 1"
+
+
+def _open_db_connection(read_only: bool = False) -> sqlite3.Connection:
+    if read_only:
+        uri = f"file:{urllib_parse.quote(os.path.abspath(DB_PATH))}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=DB_STATEMENT_CACHE_SIZE)
+    else:
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=DB_STATEMENT_CACHE_SIZE)
     conn.row_factory = sqlite3.Row
+    # Per-connection settings; journal_mode=WAL itself persists in the DB file (see init_db).
+    conn.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -64000")
+    conn.execute(f"PRAGMA mmap_size = {DB_MMAP_SIZE_BYTES}")
     return conn
 
 
-def init_db():
+@contextlib.contextmanager
+def _pooled_connection(pool: queue.SimpleQueue, read_only: bool):
+    try:
+        conn = pool.get_nowait()
+    except queue.Empty:
+        conn = _open_db_connection(read_only)
+    try:
+        with conn:
+            yield conn
+    finally:
+        if pool.qsize() < DB_POOL_SIZE:
+            pool.put(conn)
+        else:
+            _close_db_connection(conn)
+
+
+def db():
+    """
+    Borrow a warm pooled read-write connection; commits on success, rolls back on error.
+    """
+    return _pooled_connection(_DB_POOL, False)
+
+
+def read_db():
+    """
+    Borrow a pooled read-only connection. Under WAL, readers never wait on the writer.
+    """
+    return _pooled_connection(_DB_READ_POOL, True)
+
+
+def _close_db_connection(conn: sqlite3.Connection) -> None:
+    # SQLite recommends PRAGMA optimize before closing long-lived connections.
+    with contextlib.suppress(Exception):
+        if conn.total_changes:
+            conn.execute("PRAGMA optimize")
+    with contextlib.suppress(Exception):
+        conn.close()
+
+
+@contextlib.contextmanager
+def db_tx():
+    """
+    Like db(), but takes the write lock up front (BEGIN IMMEDIATE) so a
+    read-modify-write sequence runs as one atomic transaction.
+    """
     with db() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        yield conn
+
+
+@contextlib.contextmanager
+def _schema_db():
+    """
+    Unpooled connection for one-shot schema/migration SQL, closed afterwards so those
+    statements never take slots in a long-lived connection's statement cache.
+    """
+    conn = _open_db_connection()
+    try:
+        with conn:
+            yield conn
+    finally:
+        _close_db_connection(conn)
+
+
+def close_db_pool() -> None:
+    for pool in (_DB_POOL, _DB_READ_POOL):
+        while True:
+            try:
+                conn = pool.get_nowait()
+            except queue.Empty:
+                break
+            _close_db_connection(conn)
+
+
+def init_db():
+    with _schema_db() as conn:
+        journal_mode = str(conn.execute("PRAGMA journal_mode = WAL").fetchone()[0] or "").lower()
+        if journal_mode != "wal":
+            logger.warning("SQLite WAL mode unavailable for DB_PATH=%s; journal_mode=%s", DB_PATH, journal_mode)
+
         # Per-chat panel state (each user has their own panel message)
         conn.execute(
             """
@@ -410,10 +575,25 @@ def init_db():
                 confirmed_at TEXT,
                 confirmed_by INTEGER,
                 confirm_chat_id INTEGER,
-                confirm_message_id INTEGER
+                confirm_message_id INTEGER,
+                expires_at_ts INTEGER
             )
             """
         )
+        confirmation_cols = {
+            str(r["name"]).strip().lower()
+            for r in conn.execute("PRAGMA table_info(confirmations)").fetchall()
+        }
+        if "expires_at_ts" not in confirmation_cols:
+            conn.execute("ALTER TABLE confirmations ADD COLUMN expires_at_ts INTEGER")
+        # Unix-seconds mirror of expires_at so expiry filters compare integers, not ISO text.
+        conn.execute(
+            """
+            UPDATE confirmations
+            SET expires_at_ts = CAST(strftime('%s', expires_at) AS INTEGER)
+            WHERE expires_at_ts IS NULL
+            """
+        )
 
         conn.execute(
             """
@@ -492,15 +672,38 @@ def init_db():
         conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_gmail_reversals_reversal_movement_id ON gmail_reversals(reversal_movement_id)"
         )
+        # Expiry filters moved to expires_at_ts; the ISO-text index only cost writes.
+        conn.execute("DROP INDEX IF EXISTS idx_confirmations_state_expiry")
+        # Every expiry query filters on is_confirmed = 0, so index only the pending rows.
+        conn.execute("DROP INDEX IF EXISTS idx_confirmations_state_expiry_ts")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_confirmations_pending_expiry_ts "
+            "ON confirmations(expires_at_ts) WHERE is_confirmed = 0"
+        )
         conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_confirmations_state_expiry ON confirmations(is_confirmed, expires_at)"
+            "CREATE INDEX IF NOT EXISTS idx_releases_session_id_id_desc ON releases(session_id, id DESC)"
         )
+        # Refresh planner statistics so the indexes above are picked as tables grow.
+        conn.execute("ANALYZE")
+
+    # Open the long-lived pooled connections up front so handlers never pay connect/PRAGMA cost.
+    while _DB_POOL.qsize() < DB_POOL_SIZE:
+        _DB_POOL.put(_open_db_connection())
+    while _DB_READ_POOL.qsize() < DB_POOL_SIZE:
+        _DB_READ_POOL.put(_open_db_connection(read_only=True))
+    _load_global_state_cache()
+    _get_participants_cached()
+    _warm_participant_chat_states()
 
 
 # =========================
 # TIME / MONEY
 # =========================
 
+# Same as strftime("%b") under the default C locale, without the per-call format parse.
+_MONTH_ABBR = ("", "Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
 def now_utc() -> datetime:
     return datetime.now(timezone.utc)
 
@@ -509,6 +712,10 @@ def now_utc_iso() -> str:
     return now_utc().isoformat()
 
 
+def now_epoch() -> int:
+    return int(time.time())
+
+
 def iso_to_dt(s: str) -> datetime:
     return datetime.fromisoformat(s)
 
@@ -517,17 +724,35 @@ def dt_to_iso(d: datetime) -> str:
     return d.astimezone(timezone.utc).isoformat()
 
 
+# Plain "420" / "420.5" / "420.50": exact in cents, no rounding needed.
+_MONEY_PLAIN_RE = re.compile(r"([0-9]+)(?:\.([0-9]{1,2}))?")
+
+
 def money_to_cents(amount_str: str) -> int:
-    amt = Decimal(amount_str.strip())
-    cents = (amt * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP)
+    amount_str = amount_str.strip()
+    m = _MONEY_PLAIN_RE.fullmatch(amount_str)
+    if m:
+        frac = m.group(2) or ""
+        return int(m.group(1)) * 100 + int(frac.ljust(2, "0") or 0)
+    amt = Decimal(amount_str)
+    cents = (amt * _DEC_HUNDRED).quantize(_DEC_ONE, rounding=ROUND_HALF_UP)
     if cents < 0:
         raise ValueError("Negative amount not allowed")
     return int(cents)
 
 
 def cents_to_money_str(cents: int) -> str:
-    amt = Decimal(cents) / Decimal(100)
-    return f"{amt:.2f}"
+    cents = int(cents)
+    if cents < 0:
+        return "-" + cents_to_money_str(-cents)
+    return f"{cents // 100}.{cents % 100:02d}"
+
+
+def _div_round_half_up(numerator: int, denominator: int) -> int:
+    # Integer equivalent of Decimal ROUND_HALF_UP (ties away from zero); denominator > 0.
+    if numerator < 0:
+        return -((-2 * numerator + denominator) // (2 * denominator))
+    return (2 * numerator + denominator) // (2 * denominator)
 
 
 def compute_fee_net(total_cents: int) -> tuple[int, int, int]:
@@ -535,14 +760,11 @@ def compute_fee_net(total_cents: int) -> tuple[int, int, int]:
     Returns (fee_cents, network_fee_cents, net_cents)
     net = total - fee - network_fee
     """
-    total = Decimal(total_cents) / Decimal(100)
-    fee = (total * FEE_PCT).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-    network_fee = NETWORK_FEE.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-    net = (total - fee - network_fee).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-
-    fee_cents = int((fee * 100).to_integral_value(rounding=ROUND_HALF_UP))
-    network_fee_cents = int((network_fee * 100).to_integral_value(rounding=ROUND_HALF_UP))
-    net_cents = int((net * 100).to_integral_value(rounding=ROUND_HALF_UP))
+    if total_cents == 0:
+        return 0, _NETWORK_FEE_CENTS, 0
+    fee_cents = _div_round_half_up(int(total_cents) * _FEE_NUM, _FEE_DEN)
+    network_fee_cents = _NETWORK_FEE_CENTS
+    net_cents = int(total_cents) - fee_cents - network_fee_cents
 
     if net_cents < 0:
         net_cents = 0
@@ -554,17 +776,44 @@ def compute_fee_net(total_cents: int) -> tuple[int, int, int]:
 # GLOBAL STATE
 # =========================
 
+def _load_global_state_cache() -> tuple[int, int]:
+    global _GLOBAL_STATE_CACHE
+    with read_db() as conn:
+        row = conn.execute(_SQL_SELECT_GLOBAL_STATE).fetchone()
+    # Positional access: this reload runs after every write to the total.
+    _GLOBAL_STATE_CACHE = (int(row[0]), int(row[1]))
+    return _GLOBAL_STATE_CACHE
+
+
+def _refreshes_global_state(func):
+    """
+    Re-read the cached global_state row once func's transaction has finished.
+    Reloading after commit/rollback keeps the mirror equal to what is on disk.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _load_global_state_cache()
+
+    return wrapper
+
+
 def get_global_state() -> dict:
-    with db() as conn:
-        row = conn.execute("SELECT total_cents, session_id FROM global_state WHERE id = 1").fetchone()
-        return {"total_cents": int(row["total_cents"]), "session_id": int(row["session_id"])}
+    cached = _GLOBAL_STATE_CACHE
+    if cached is None:
+        cached = _load_global_state_cache()
+    return {"total_cents": cached[0], "session_id": cached[1]}
 
 
+@_refreshes_global_state
 def set_global_total(total_cents: int):
     with db() as conn:
-        conn.execute("UPDATE global_state SET total_cents = ? WHERE id = 1", (total_cents,))
+        conn.execute(_SQL_UPDATE_GLOBAL_TOTAL, (total_cents,))
 
 
+@_refreshes_global_state
 def set_global_session(session_id: int):
     with db() as conn:
         conn.execute("UPDATE global_state SET session_id = ? WHERE id = 1", (session_id,))
@@ -575,6 +824,9 @@ def set_global_session(session_id: int):
 # =========================
 
 def get_chat_state(chat_id: int) -> dict:
+    cached = _CHAT_STATE_CACHE.get(chat_id)
+    if cached is not None:
+        return dict(cached)
     with db() as conn:
         row = conn.execute("SELECT * FROM chat_state WHERE chat_id = ?", (chat_id,)).fetchone()
         if row is None:
@@ -582,32 +834,59 @@ def get_chat_state(chat_id: int) -> dict:
                 "INSERT INTO chat_state(chat_id, panel_message_id, panel_mode, banner_message_id, subview_message_id) VALUES (?, NULL, 'text', NULL, NULL)",
                 (chat_id,),
             )
-            return {
+            data = {
                 "chat_id": chat_id,
                 "panel_message_id": None,
                 "panel_mode": "text",
                 "banner_message_id": None,
                 "subview_message_id": None,
             }
+        else:
+            data = dict(row)
+            data.setdefault("banner_message_id", None)
+            data.setdefault("subview_message_id", None)
+    _CHAT_STATE_CACHE[chat_id] = data
+    return dict(data)
+
+
+def _warm_participant_chat_states() -> None:
+    # One JOIN at startup instead of one chat_state SELECT per participant on first render.
+    with read_db() as conn:
+        rows = conn.execute(
+            """
+            SELECT cs.*
+            FROM participants p
+            JOIN chat_state cs ON cs.chat_id = p.user_id
+            """
+        ).fetchall()
+    for row in rows:
         data = dict(row)
         data.setdefault("banner_message_id", None)
         data.setdefault("subview_message_id", None)
-        return data
+        _CHAT_STATE_CACHE.setdefault(int(data["chat_id"]), data)
 
 
-def set_panel_message_id(chat_id: int, message_id: int | None):
+def _set_chat_state_field(chat_id: int, column: str, value) -> None:
+    # Write-through: persist first, then mirror into the cache if the chat is loaded.
     with db() as conn:
-        conn.execute("UPDATE chat_state SET panel_message_id = ? WHERE chat_id = ?", (message_id, chat_id))
+        conn.execute(f"UPDATE chat_state SET {column} = ? WHERE chat_id = ?", (value, chat_id))
+    cached = _CHAT_STATE_CACHE.get(chat_id)
+    if cached is not None:
+        cached[column] = value
+
+
+def set_panel_message_id(chat_id: int, message_id: int | None):
+    if message_id is None:
+        _LAST_PANEL_RENDER.pop(chat_id, None)
+    _set_chat_state_field(chat_id, "panel_message_id", message_id)
 
 
 def set_panel_mode(chat_id: int, mode: str):
-    with db() as conn:
-        conn.execute("UPDATE chat_state SET panel_mode = ? WHERE chat_id = ?", (mode, chat_id))
+    _set_chat_state_field(chat_id, "panel_mode", mode)
 
 
 def set_banner_message_id(chat_id: int, message_id: int | None):
-    with db() as conn:
-        conn.execute("UPDATE chat_state SET banner_message_id = ? WHERE chat_id = ?", (message_id, chat_id))
+    _set_chat_state_field(chat_id, "banner_message_id", message_id)
 
 
 def get_banner_message_id(chat_id: int) -> int | None:
@@ -617,8 +896,9 @@ def get_banner_message_id(chat_id: int) -> int | None:
 
 
 def set_subview_message_id(chat_id: int, message_id: int | None):
-    with db() as conn:
-        conn.execute("UPDATE chat_state SET subview_message_id = ? WHERE chat_id = ?", (message_id, chat_id))
+    if message_id is None:
+        _LAST_SUBVIEW_RENDER.pop(chat_id, None)
+    _set_chat_state_field(chat_id, "subview_message_id", message_id)
 
 
 def get_subview_message_id(chat_id: int) -> int | None:
@@ -632,15 +912,15 @@ def get_subview_message_id(chat_id: int) -> int | None:
 # =========================
 
 def participant_count() -> int:
-    with db() as conn:
-        row = conn.execute("SELECT COUNT(*) AS c FROM participants").fetchone()
-        return int(row["c"])
+    # Same cache as get_participants/is_participant; add_participant invalidates it after insert.
+    return len(_get_participants_cached())
 
 
 def is_participant(user_id: int) -> bool:
-    with db() as conn:
-        row = conn.execute("SELECT 1 FROM participants WHERE user_id = ?", (user_id,)).fetchone()
-        return row is not None
+    # Runs on every update; the frozenset is rebuilt together with the ordered tuple.
+    if _PARTICIPANTS_CACHE is None:
+        _get_participants_cached()
+    return user_id in _PARTICIPANT_ID_SET
 
 
 def add_participant(user_id: int, first_name: str | None, username: str | None) -> bool:
@@ -649,31 +929,52 @@ def add_participant(user_id: int, first_name: str | None, username: str | None)
     """
     if is_participant(user_id):
         return True
-    if participant_count() >= MAX_PARTICIPANTS:
-        return False
     with db() as conn:
-        conn.execute(
+        cur = conn.execute(
             """
             INSERT INTO participants(user_id, first_name, username, added_at)
-            VALUES (?, ?, ?, ?)
+            SELECT ?, ?, ?, ?
+            WHERE (SELECT COUNT(*) FROM participants) < ?
+            ON CONFLICT(user_id) DO NOTHING
             """,
-            (user_id, first_name or "", username or "", now_utc_iso()),
+            (user_id, first_name or "", username or "", now_utc_iso(), MAX_PARTICIPANTS),
         )
+        if cur.rowcount <= 0:
+            row = conn.execute("SELECT 1 FROM participants WHERE user_id = ?", (user_id,)).fetchone()
+            return row is not None
+    # Invalidate only after the INSERT has committed.
+    _invalidate_participants_cache()
     return True
 
 
+def _get_participants_cached() -> tuple[int, ...]:
+    global _PARTICIPANTS_CACHE, _PARTICIPANT_ID_SET
+    cached = _PARTICIPANTS_CACHE
+    if cached is not None:
+        return cached
+    with _PARTICIPANTS_CACHE_LOCK:
+        if _PARTICIPANTS_CACHE is None:
+            with read_db() as conn:
+                rows = conn.execute("SELECT user_id FROM participants ORDER BY added_at ASC").fetchall()
+            participants = tuple(int(r[0]) for r in rows)
+            _PARTICIPANT_ID_SET = frozenset(participants)
+            _PARTICIPANTS_CACHE = participants
+        return _PARTICIPANTS_CACHE
+
+
+def _invalidate_participants_cache() -> None:
+    global _PARTICIPANTS_CACHE
+    with _PARTICIPANTS_CACHE_LOCK:
+        _PARTICIPANTS_CACHE = None
+
+
 def get_participants() -> list[int]:
-    with db() as conn:
-        rows = conn.execute("SELECT user_id FROM participants ORDER BY added_at ASC").fetchall()
-        return [int(r["user_id"]) for r in rows]
+    return list(_get_participants_cached())
 
 
 def get_confirmer_id() -> int | None:
-    with db() as conn:
-        row = conn.execute(
-            "SELECT user_id FROM participants ORDER BY added_at ASC LIMIT 1"
-        ).fetchone()
-        return int(row["user_id"]) if row else None
+    participants = _get_participants_cached()
+    return participants[0] if participants else None
 
 
 def _participant_display_name(first_name: str | None, username: str | None, user_id: int) -> str:
@@ -687,7 +988,7 @@ def _participant_display_name(first_name: str | None, username: str | None, user
 
 
 def get_participant_display_name_map() -> dict[int, str]:
-    with db() as conn:
+    with read_db() as conn:
         rows = conn.execute(
             "SELECT user_id, first_name, username FROM participants"
         ).fetchall()
@@ -702,20 +1003,67 @@ def get_participant_display_name_map() -> dict[int, str]:
 # CONFIRMATIONS
 # =========================
 
-def pending_confirmations_count() -> int:
-    now = now_utc_iso()
-    with db() as conn:
-        row = conn.execute(
+def _get_pending_expiries() -> tuple[int, ...]:
+    global _PENDING_EXPIRIES
+    cached = _PENDING_EXPIRIES
+    if cached is not None:
+        return cached
+    with _PENDING_EXPIRIES_LOCK:
+        generation = _PENDING_EXPIRIES_GEN
+    with read_db() as conn:
+        rows = conn.execute(
             """
-            SELECT COUNT(*) AS c
+            SELECT expires_at_ts
             FROM confirmations
-            WHERE is_confirmed = 0 AND expires_at > ?
-            """,
-            (now,),
-        ).fetchone()
-        return int(row["c"])
+            WHERE is_confirmed = 0 AND expires_at_ts IS NOT NULL
+            ORDER BY expires_at_ts
+            """
+        ).fetchall()
+    expiries = tuple(int(r[0]) for r in rows)
+    with _PENDING_EXPIRIES_LOCK:
+        if generation == _PENDING_EXPIRIES_GEN:
+            _PENDING_EXPIRIES = expiries
+    return expiries
 
 
+def _invalidates_pending_confirmations(func):
+    """
+    Drop the pending-expiry cache once func's transaction has finished.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        global _PENDING_EXPIRIES, _PENDING_EXPIRIES_GEN
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with _PENDING_EXPIRIES_LOCK:
+                _PENDING_EXPIRIES = None
+                _PENDING_EXPIRIES_GEN += 1
+
+    return wrapper
+
+
+def pending_confirmations_count() -> int:
+    # Expiry is time-based, so keep the timestamps and count the unexpired tail.
+    expiries = _get_pending_expiries()
+    return len(expiries) - bisect.bisect_right(expiries, now_epoch())
+
+
+def get_panel_snapshot() -> dict:
+    """
+    Everything the dashboard needs; only the tracking mode is still read from SQLite.
+    """
+    g = get_global_state()
+    return {
+        "total_cents": g["total_cents"],
+        "session_id": g["session_id"],
+        "pending": pending_confirmations_count(),
+        "tracking_mode": get_tracking_mode(),
+        "confirmer_id": get_confirmer_id(),
+    }
+
+
+@_invalidates_pending_confirmations
 def create_confirmation_for_movement(movement_id: int, actor_id: int, amount_cents: int) -> None:
     created = now_utc()
     expires = created + timedelta(seconds=CONFIRM_WINDOW_SECONDS)
@@ -724,38 +1072,29 @@ def create_confirmation_for_movement(movement_id: int, actor_id: int, amount_cen
             """
             INSERT OR REPLACE INTO confirmations(
                 movement_id, actor_id, amount_cents, created_at, expires_at,
-                is_confirmed, confirmed_at, confirmed_by, confirm_chat_id, confirm_message_id
-            ) VALUES (?, ?, ?, ?, ?, 0, NULL, NULL, NULL, NULL)
+                is_confirmed, confirmed_at, confirmed_by, confirm_chat_id, confirm_message_id,
+                expires_at_ts
+            ) VALUES (?, ?, ?, ?, ?, 0, NULL, NULL, NULL, NULL, ?)
             """,
-            (movement_id, actor_id, amount_cents, dt_to_iso(created), dt_to_iso(expires)),
+            (movement_id, actor_id, amount_cents, dt_to_iso(created), dt_to_iso(expires), int(expires.timestamp())),
         )
 
 
 def get_confirmation(movement_id: int) -> sqlite3.Row | None:
-    with db() as conn:
+    with read_db() as conn:
         return conn.execute(
             "SELECT * FROM confirmations WHERE movement_id = ?",
             (movement_id,),
         ).fetchone()
 
 
-def mark_confirmed(movement_id: int, confirmed_by: int):
-    with db() as conn:
-        conn.execute(
-            """
-            UPDATE confirmations
-            SET is_confirmed = 1, confirmed_at = ?, confirmed_by = ?
-            WHERE movement_id = ?
-            """,
-            (now_utc_iso(), confirmed_by, movement_id),
-        )
-
-
+@_invalidates_pending_confirmations
 def confirm_movement_tx(movement_id: int, confirmer_id: int) -> dict:
     """
     Atomically checks and confirms a movement confirmation record.
+    Non-missing results carry the confirm message refs so callers can delete it without a lookup.
     """
-    with db() as conn:
+    with db_tx() as conn:
         row = conn.execute(
             "SELECT * FROM confirmations WHERE movement_id = ?",
             (movement_id,),
@@ -766,12 +1105,16 @@ def confirm_movement_tx(movement_id: int, confirmer_id: int) -> dict:
 
         actor_id = int(row["actor_id"])
         amount_cents = int(row["amount_cents"])
+        confirm_chat_id = row["confirm_chat_id"]
+        confirm_message_id = row["confirm_message_id"]
 
         if int(row["is_confirmed"]) == 1:
             return {
                 "status": "already_confirmed",
                 "actor_id": actor_id,
                 "amount_cents": amount_cents,
+                "confirm_chat_id": confirm_chat_id,
+                "confirm_message_id": confirm_message_id,
             }
 
         conn.execute(
@@ -787,6 +1130,8 @@ def confirm_movement_tx(movement_id: int, confirmer_id: int) -> dict:
             "status": "confirmed",
             "actor_id": actor_id,
             "amount_cents": amount_cents,
+            "confirm_chat_id": confirm_chat_id,
+            "confirm_message_id": confirm_message_id,
         }
 
 
@@ -802,47 +1147,105 @@ def set_confirm_message_refs(movement_id: int, chat_id: int, message_id: int):
         )
 
 
+@_invalidates_pending_confirmations
 def delete_confirmation(movement_id: int):
     with db() as conn:
         conn.execute("DELETE FROM confirmations WHERE movement_id = ?", (movement_id,))
 
 
-async def try_delete_confirm_message(context: ContextTypes.DEFAULT_TYPE, movement_id: int):
-    row = get_confirmation(movement_id)
-    if not row:
-        return
-    chat_id = row["confirm_chat_id"]
-    msg_id = row["confirm_message_id"]
-    if chat_id and msg_id:
-        try:
-            await context.bot.delete_message(chat_id=int(chat_id), message_id=int(msg_id))
-        except Exception:
-            pass
+async def try_delete_confirm_message(
+    context: ContextTypes.DEFAULT_TYPE,
+    chat_id: int | None,
+    message_id: int | None,
+) -> None:
+    # Callers pass the refs they already read; a confirmation that was never sent has none.
+    if chat_id and message_id:
+        await try_delete_message(context, int(chat_id), int(message_id))
 
 
-async def cleanup_expired_confirmations(context: ContextTypes.DEFAULT_TYPE):
+@_invalidates_pending_confirmations
+def auto_confirm_expired_tx(now_ts: int) -> list[tuple[int, int | None, int | None]]:
     """
-    Auto-confirm expired items (24h). Also attempt to delete their confirm messages.
-    Safe to call often.
+    Marks every expired pending confirmation as confirmed by 0 in one statement.
+    Returns (movement_id, confirm_chat_id, confirm_message_id) per affected row.
     """
-    now_iso = now_utc_iso()
-    async with STATE_LOCK:
-        with db() as conn:
+    confirmed_at = now_utc_iso()
+    with db_tx() as conn:
+        if _SQLITE_HAS_RETURNING:
+            rows = conn.execute(
+                """
+                UPDATE confirmations
+                SET is_confirmed = 1, confirmed_at = ?, confirmed_by = 0
+                WHERE is_confirmed = 0 AND expires_at_ts <= ?
+                RETURNING movement_id, confirm_chat_id, confirm_message_id
+                """,
+                (confirmed_at, now_ts),
+            ).fetchall()
+        else:
             rows = conn.execute(
                 """
-                SELECT movement_id
+                SELECT movement_id, confirm_chat_id, confirm_message_id
                 FROM confirmations
-                WHERE is_confirmed = 0 AND expires_at <= ?
+                WHERE is_confirmed = 0 AND expires_at_ts <= ?
                 """,
-                (now_iso,),
+                (now_ts,),
             ).fetchall()
+            conn.executemany(
+                """
+                UPDATE confirmations
+                SET is_confirmed = 1, confirmed_at = ?, confirmed_by = 0
+                WHERE movement_id = ?
+                """,
+                [(confirmed_at, int(r["movement_id"])) for r in rows],
+            )
+    return [
+        (
+            int(r["movement_id"]),
+            int(r["confirm_chat_id"]) if r["confirm_chat_id"] else None,
+            int(r["confirm_message_id"]) if r["confirm_message_id"] else None,
+        )
+        for r in rows
+    ]
 
-        mids = [int(r["movement_id"]) for r in rows]
-        for mid in mids:
-            mark_confirmed(mid, confirmed_by=0)
 
-    for mid in mids:
-        await try_delete_confirm_message(context, mid)
+async def cleanup_expired_confirmations_for_app(app: Application):
+    """
+    Auto-confirm expired items (24h). Also attempt to delete their confirm messages.
+    Safe to call often.
+    """
+    # auto_confirm_expired_tx is a single BEGIN IMMEDIATE transaction that never touches
+    # the total, so SQLite serializes it against add/undo without holding STATE_LOCK.
+    expired = await asyncio.to_thread(auto_confirm_expired_tx, now_epoch())
+
+    if not expired:
+        return
+
+    await asyncio.gather(
+        *(
+            app.bot.delete_message(chat_id=chat_id, message_id=msg_id)
+            for _, chat_id, msg_id in expired
+            if chat_id and msg_id
+        ),
+        return_exceptions=True,
+    )
+
+
+async def confirmation_cleanup_loop(app: Application) -> None:
+    # Pending counts already ignore expired rows, so sweeping on a timer (not per update) is enough.
+    try:
+        await asyncio.sleep(min(30, CONFIRM_CLEANUP_INTERVAL_SECONDS))
+        while True:
+            try:
+                await cleanup_expired_confirmations_for_app(app)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Unexpected confirmation cleanup loop error", exc_info=True)
+
+            await asyncio.sleep(CONFIRM_CLEANUP_INTERVAL_SECONDS)
+    except asyncio.CancelledError:
+        logger.info("Confirmation cleanup loop stopped")
+        raise
 
 
 def _normalize_sender_email(email_text: str | None) -> str:
@@ -893,11 +1296,11 @@ def _json_loads_object_or_none(text: str | None) -> dict | None:
 
 
 def get_app_setting(key: str) -> str | None:
-    with db() as conn:
+    with read_db() as conn:
         row = conn.execute("SELECT value FROM app_settings WHERE key = ?", (str(key),)).fetchone()
         if not row:
             return None
-        return str(row["value"])
+        return str(row[0])
 
 
 def _normalize_tracking_mode(value: str | None) -> str:
@@ -917,7 +1320,7 @@ def get_tracking_mode() -> str:
 def set_tracking_mode_tx(mode: str, updated_by: int | None) -> dict:
     normalized = _normalize_tracking_mode(mode)
     now_iso = now_utc_iso()
-    with db() as conn:
+    with db_tx() as conn:
         row = conn.execute("SELECT value FROM app_settings WHERE key = 'tracking_mode'").fetchone()
         previous = _normalize_tracking_mode(str(row["value"])) if row and row["value"] is not None else TRACKING_MODE_DEFAULT
         conn.execute(
@@ -1023,33 +1426,25 @@ def _insert_gmail_processed_message_in_conn(
     )
 
 
+@_refreshes_global_state
 def add_amount_auto_confirmed(actor_id: int, add_cents: int) -> tuple[int, int]:
     """
     Atomically updates total and logs an ADD movement without creating a pending confirmation.
     Returns (movement_id, new_total_cents).
     """
     created_iso = now_utc_iso()
-    with db() as conn:
-        row = conn.execute(
-            "SELECT total_cents, session_id FROM global_state WHERE id = 1"
-        ).fetchone()
+    with db_tx() as conn:
+        row = conn.execute(_SQL_SELECT_GLOBAL_STATE).fetchone()
         total_cents = int(row["total_cents"]) + add_cents
         session_id = int(row["session_id"])
 
-        conn.execute("UPDATE global_state SET total_cents = ? WHERE id = 1", (total_cents,))
-        cur = conn.execute(
-            """
-            INSERT INTO movements(session_id, kind, amount_cents, total_after_cents, actor_id, created_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (session_id, "add", add_cents, total_cents, actor_id, created_iso),
-        )
-        movement_id = int(cur.lastrowid)
+        conn.execute(_SQL_UPDATE_GLOBAL_TOTAL, (total_cents,))
+        movement_id = _insert_movement(conn, session_id, "add", add_cents, total_cents, actor_id, created_iso)
     return movement_id, total_cents
 
 
 def get_gmail_sender_trust_by_id(sender_trust_id: int) -> sqlite3.Row | None:
-    with db() as conn:
+    with read_db() as conn:
         return conn.execute(
             "SELECT * FROM gmail_sender_trust WHERE id = ?",
             (sender_trust_id,),
@@ -1058,7 +1453,7 @@ def get_gmail_sender_trust_by_id(sender_trust_id: int) -> sqlite3.Row | None:
 
 def sendertrust_action_tx(sender_trust_id: int, action: str, acting_user_id: int) -> dict:
     now_iso = now_utc_iso()
-    with db() as conn:
+    with db_tx() as conn:
         row = conn.execute(
             "SELECT * FROM gmail_sender_trust WHERE id = ?",
             (sender_trust_id,),
@@ -1147,7 +1542,7 @@ def _format_elapsed_ago_short(dt: datetime | None, now_dt: datetime | None = Non
 def get_gmail_sender_trust_counts() -> dict[str, int]:
     counts = {"approved": 0, "quarantine": 0, "blocked": 0}
     try:
-        with db() as conn:
+        with read_db() as conn:
             rows = conn.execute(
                 "SELECT state, COUNT(*) AS c FROM gmail_sender_trust GROUP BY state"
             ).fetchall()
@@ -1189,8 +1584,9 @@ def _format_sender_list_last_seen(last_seen_dt: datetime | None) -> str:
     if last_seen_dt is None:
         return "--"
     local_dt = last_seen_dt.astimezone(_get_kraken_display_tzinfo())
-    hour_12 = local_dt.strftime("%I").lstrip("0") or "12"
-    return f"{local_dt.strftime('%b')} {local_dt.day} {hour_12}:{local_dt.strftime('%M')} {local_dt.strftime('%p')}"
+    hour_12 = local_dt.hour % 12 or 12
+    ampm = "AM" if local_dt.hour < 12 else "PM"
+    return f"{_MONTH_ABBR[local_dt.month]} {local_dt.day} {hour_12}:{local_dt.minute:02d} {ampm}"
 
 
 def _sender_state_badge(state: str) -> str:
@@ -1213,7 +1609,7 @@ def list_ranked_gmail_senders(page: int, page_size: int = GMAIL_SENDER_LIST_PAGE
     )
     placeholders = ",".join(["?"] * len(matched_statuses))
 
-    with db() as conn:
+    with read_db() as conn:
         trust_rows = conn.execute(
             """
             SELECT id, sender_email, state, first_seen_at, last_seen_at, seen_count, last_matched_amount_cents, display_name_hint
@@ -1336,7 +1732,7 @@ def build_senders_list_text(page: int, viewer_id: int) -> tuple[str, bool, bool]
         badge = _sender_state_badge(state)
         seen_count = int(row.get("seen_count") or 0)
         avg_cents = int(row.get("avg_amount_cents") or 0)
-        avg_amount_txt = _format_usd_est_amount_int(Decimal(avg_cents) / Decimal(100))
+        avg_amount_txt = _format_usd_est_amount_int(Decimal(avg_cents) / _DEC_HUNDRED)
         last_seen_txt = _format_sender_list_last_seen(row.get("last_seen_at"))
 
         lines.append(f"{rank_num}. {badge} <code>{display_txt}</code>")
@@ -1388,7 +1784,7 @@ def list_recent_gmail_auto_added_events(
 ) -> tuple[list[dict], bool, bool]:
     page = max(0, int(page))
     page_size = max(1, int(page_size))
-    with db() as conn:
+    with read_db() as conn:
         rows = conn.execute(
             """
             SELECT
@@ -1432,7 +1828,7 @@ def get_recent_gmail_auto_added_event_by_message_id(gmail_message_id: str) -> di
     msg_id = str(gmail_message_id or "").strip()
     if not msg_id:
         return None
-    with db() as conn:
+    with read_db() as conn:
         row = conn.execute(
             """
             SELECT
@@ -1554,13 +1950,14 @@ def build_admin_reverse_confirm_keyboard(gmail_message_id: str, *, is_reversed:
     return InlineKeyboardMarkup(rows)
 
 
+@_refreshes_global_state
 def admin_reverse_gmail_event_tx(gmail_message_id: str, acting_user_id: int, *, block_payer: bool = False) -> dict:
     msg_id = str(gmail_message_id or "").strip()
     if not msg_id:
         return {"status": "invalid"}
 
     now_iso = now_utc_iso()
-    with db() as conn:
+    with db_tx() as conn:
         row = conn.execute(
             """
             SELECT g.gmail_message_id, g.movement_id, g.parsed_amount_cents, g.notes
@@ -1598,22 +1995,23 @@ def admin_reverse_gmail_event_tx(gmail_message_id: str, acting_user_id: int, *,
         payer_key = str((meta or {}).get("payer_key") or (meta or {}).get("identity_key") or "").strip()
         payer_display = str((meta or {}).get("payer_display") or (meta or {}).get("identity_display") or "").strip()
 
-        g = conn.execute("SELECT total_cents, session_id FROM global_state WHERE id = 1").fetchone()
+        g = conn.execute(_SQL_SELECT_GLOBAL_STATE).fetchone()
         current_total = int(g["total_cents"])
         current_session = int(g["session_id"])
         new_total = current_total - amount_cents
         if new_total < 0:
             new_total = 0
 
-        conn.execute("UPDATE global_state SET total_cents = ? WHERE id = 1", (new_total,))
-        cur = conn.execute(
-            """
-            INSERT INTO movements(session_id, kind, amount_cents, total_after_cents, actor_id, created_at)
-            VALUES (?, 'reversal', ?, ?, ?, ?)
-            """,
-            (current_session, amount_cents, new_total, acting_user_id, now_iso),
+        conn.execute(_SQL_UPDATE_GLOBAL_TOTAL, (new_total,))
+        reversal_movement_id = _insert_movement(
+            conn,
+            current_session,
+            "reversal",
+            amount_cents,
+            new_total,
+            acting_user_id,
+            now_iso,
         )
-        reversal_movement_id = int(cur.lastrowid)
 
         conn.execute(
             """
@@ -1662,6 +2060,7 @@ def admin_reverse_gmail_event_tx(gmail_message_id: str, acting_user_id: int, *,
         }
 
 
+@_refreshes_global_state
 def process_gmail_zelle_parsed_tx(parsed: dict, actor_id: int | None, mode: str) -> dict:
     """
     Dedupe + trust-policy + optional auto-add for a parsed Gmail Zelle candidate.
@@ -1698,7 +2097,7 @@ def process_gmail_zelle_parsed_tx(parsed: dict, actor_id: int | None, mode: str)
         meta = _gmail_bask_metadata_from_parsed(parsed)
     base_notes = _json_dumps_compact(meta)
 
-    with db() as conn:
+    with db_tx() as conn:
         existing = conn.execute(
             "SELECT status, movement_id FROM gmail_processed_messages WHERE gmail_message_id = ?",
             (gmail_message_id,),
@@ -1843,20 +2242,11 @@ def process_gmail_zelle_parsed_tx(parsed: dict, actor_id: int | None, mode: str)
                 "state": state,
             }
 
-        row = conn.execute(
-            "SELECT total_cents, session_id FROM global_state WHERE id = 1"
-        ).fetchone()
+        row = conn.execute(_SQL_SELECT_GLOBAL_STATE).fetchone()
         total_cents = int(row["total_cents"]) + amount_cents
         session_id = int(row["session_id"])
-        conn.execute("UPDATE global_state SET total_cents = ? WHERE id = 1", (total_cents,))
-        cur = conn.execute(
-            """
-            INSERT INTO movements(session_id, kind, amount_cents, total_after_cents, actor_id, created_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (session_id, "add", amount_cents, total_cents, actor_id, now_iso),
-        )
-        movement_id = int(cur.lastrowid)
+        conn.execute(_SQL_UPDATE_GLOBAL_TOTAL, (total_cents,))
+        movement_id = _insert_movement(conn, session_id, "add", amount_cents, total_cents, actor_id, now_iso)
 
         _insert_gmail_processed_message_in_conn(
             conn,
@@ -1893,7 +2283,7 @@ def record_gmail_processed_message_tx(parsed: dict, status: str, notes: str | No
     if not gmail_message_id:
         return {"status": "invalid_parsed", "reason": "missing_message_id"}
 
-    with db() as conn:
+    with db_tx() as conn:
         existing = conn.execute(
             "SELECT status, movement_id FROM gmail_processed_messages WHERE gmail_message_id = ?",
             (gmail_message_id,),
@@ -1915,7 +2305,7 @@ def filter_unprocessed_gmail_message_ids(message_ids: list[str]) -> list[str]:
         return []
 
     placeholders = ",".join("?" for _ in ids)
-    with db() as conn:
+    with read_db() as conn:
         rows = conn.execute(
             f"SELECT gmail_message_id FROM gmail_processed_messages WHERE gmail_message_id IN ({placeholders})",
             tuple(ids),
@@ -1924,6 +2314,8 @@ def filter_unprocessed_gmail_message_ids(message_ids: list[str]) -> list[str]:
     return [mid for mid in ids if mid not in seen]
 
 
+@_refreshes_global_state
+@_invalidates_pending_confirmations
 def add_amount_with_confirmation(actor_id: int, add_cents: int) -> tuple[int, int]:
     """
     Atomically updates total, logs the movement, and creates the confirmation row.
@@ -1931,48 +2323,46 @@ def add_amount_with_confirmation(actor_id: int, add_cents: int) -> tuple[int, in
     """
     created = now_utc()
     created_iso = dt_to_iso(created)
-    expires_iso = dt_to_iso(created + timedelta(seconds=CONFIRM_WINDOW_SECONDS))
-
-    with db() as conn:
-        row = conn.execute(
-            "SELECT total_cents, session_id FROM global_state WHERE id = 1"
-        ).fetchone()
-        total_cents = int(row["total_cents"]) + add_cents
-        session_id = int(row["session_id"])
-
-        conn.execute("UPDATE global_state SET total_cents = ? WHERE id = 1", (total_cents,))
+    expires = created + timedelta(seconds=CONFIRM_WINDOW_SECONDS)
+    expires_iso = dt_to_iso(expires)
+    expires_ts = int(expires.timestamp())
+
+    with db_tx() as conn:
+        if _SQLITE_HAS_RETURNING:
+            total_cents, session_id = conn.execute(
+                "UPDATE global_state SET total_cents = total_cents + ? WHERE id = 1 RETURNING total_cents, session_id",
+                (add_cents,),
+            ).fetchone()
+        else:
+            row = conn.execute(_SQL_SELECT_GLOBAL_STATE).fetchone()
+            total_cents = int(row["total_cents"]) + add_cents
+            session_id = int(row["session_id"])
+            conn.execute(_SQL_UPDATE_GLOBAL_TOTAL, (total_cents,))
 
-        cur = conn.execute(
-            """
-            INSERT INTO movements(session_id, kind, amount_cents, total_after_cents, actor_id, created_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (session_id, "add", add_cents, total_cents, actor_id, created_iso),
-        )
-        movement_id = int(cur.lastrowid)
+        movement_id = _insert_movement(conn, session_id, "add", add_cents, total_cents, actor_id, created_iso)
 
         conn.execute(
             """
             INSERT OR REPLACE INTO confirmations(
                 movement_id, actor_id, amount_cents, created_at, expires_at,
-                is_confirmed, confirmed_at, confirmed_by, confirm_chat_id, confirm_message_id
-            ) VALUES (?, ?, ?, ?, ?, 0, NULL, NULL, NULL, NULL)
+                is_confirmed, confirmed_at, confirmed_by, confirm_chat_id, confirm_message_id,
+                expires_at_ts
+            ) VALUES (?, ?, ?, ?, ?, 0, NULL, NULL, NULL, NULL, ?)
             """,
-            (movement_id, actor_id, add_cents, created_iso, expires_iso),
+            (movement_id, actor_id, add_cents, created_iso, expires_iso, expires_ts),
         )
 
     return movement_id, total_cents
 
 
+@_refreshes_global_state
 def release_current_total(actor_id: int) -> dict | None:
     """
     Atomically records a release, logs it, and resets the running total/session.
     Returns release summary data or None if total <= 0.
     """
-    with db() as conn:
-        row = conn.execute(
-            "SELECT total_cents, session_id FROM global_state WHERE id = 1"
-        ).fetchone()
+    with db_tx() as conn:
+        row = conn.execute(_SQL_SELECT_GLOBAL_STATE).fetchone()
         total_cents = int(row["total_cents"])
         session_id = int(row["session_id"])
 
@@ -1990,13 +2380,7 @@ def release_current_total(actor_id: int) -> dict | None:
             (session_id, total_cents, fee_cents, network_fee_cents, net_cents, actor_id, ts),
         )
 
-        conn.execute(
-            """
-            INSERT INTO movements(session_id, kind, amount_cents, total_after_cents, actor_id, created_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (session_id, "release", total_cents, 0, actor_id, ts),
-        )
+        _insert_movement(conn, session_id, "release", total_cents, 0, actor_id, ts)
 
         conn.execute(
             "UPDATE global_state SET total_cents = 0, session_id = ? WHERE id = 1",
@@ -2012,11 +2396,13 @@ def release_current_total(actor_id: int) -> dict | None:
     }
 
 
+@_refreshes_global_state
+@_invalidates_pending_confirmations
 def undo_last_movement_tx() -> dict | None:
     """
     Atomically undoes the latest movement and returns metadata for notifications/UI.
     """
-    with db() as conn:
+    with db_tx() as conn:
         last = conn.execute(
             """
             SELECT id, session_id, kind, amount_cents, total_after_cents, actor_id, created_at
@@ -2033,9 +2419,7 @@ def undo_last_movement_tx() -> dict | None:
         last_session = int(last["session_id"])
         last_id = int(last["id"])
 
-        g = conn.execute(
-            "SELECT total_cents, session_id FROM global_state WHERE id = 1"
-        ).fetchone()
+        g = conn.execute(_SQL_SELECT_GLOBAL_STATE).fetchone()
         current_total = int(g["total_cents"])
         current_session = int(g["session_id"])
 
@@ -2047,17 +2431,26 @@ def undo_last_movement_tx() -> dict | None:
             if new_total < 0:
                 new_total = 0
 
-            conf = conn.execute(
-                """
-                SELECT confirm_chat_id, confirm_message_id
-                FROM confirmations
-                WHERE movement_id = ?
-                """,
-                (last_id,),
-            ).fetchone()
-
-            conn.execute("DELETE FROM confirmations WHERE movement_id = ?", (last_id,))
-            conn.execute("UPDATE global_state SET total_cents = ? WHERE id = 1", (new_total,))
+            if _SQLITE_HAS_RETURNING:
+                conf = conn.execute(
+                    """
+                    DELETE FROM confirmations
+                    WHERE movement_id = ?
+                    RETURNING confirm_chat_id, confirm_message_id
+                    """,
+                    (last_id,),
+                ).fetchone()
+            else:
+                conf = conn.execute(
+                    """
+                    SELECT confirm_chat_id, confirm_message_id
+                    FROM confirmations
+                    WHERE movement_id = ?
+                    """,
+                    (last_id,),
+                ).fetchone()
+                conn.execute("DELETE FROM confirmations WHERE movement_id = ?", (last_id,))
+            conn.execute(_SQL_UPDATE_GLOBAL_TOTAL, (new_total,))
             conn.execute("DELETE FROM movements WHERE id = ?", (last_id,))
 
             return {
@@ -2096,7 +2489,7 @@ def undo_last_movement_tx() -> dict | None:
 
         if last_kind == "reversal":
             new_total = current_total + last_amount
-            conn.execute("UPDATE global_state SET total_cents = ? WHERE id = 1", (new_total,))
+            conn.execute(_SQL_UPDATE_GLOBAL_TOTAL, (new_total,))
             rev = conn.execute(
                 """
                 SELECT id, gmail_message_id
@@ -2123,22 +2516,38 @@ def undo_last_movement_tx() -> dict | None:
 # MOVEMENTS / RELEASES
 # =========================
 
-def log_movement(kind: str, amount_cents: int, total_after_cents: int, actor_id: int) -> int:
-    g = get_global_state()
-    session_id = g["session_id"]
-    with db() as conn:
-        cur = conn.execute(
+def _insert_movement(
+    conn: sqlite3.Connection,
+    session_id: int,
+    kind: str,
+    amount_cents: int,
+    total_after_cents: int,
+    actor_id: int | None,
+    created_at: str,
+) -> int:
+    params = (session_id, kind, amount_cents, total_after_cents, actor_id, created_at)
+    if _SQLITE_HAS_RETURNING:
+        row = conn.execute(
             """
             INSERT INTO movements(session_id, kind, amount_cents, total_after_cents, actor_id, created_at)
             VALUES (?, ?, ?, ?, ?, ?)
+            RETURNING id
             """,
-            (session_id, kind, amount_cents, total_after_cents, actor_id, now_utc_iso()),
-        )
-        return int(cur.lastrowid)
+            params,
+        ).fetchone()
+        return int(row[0])
+    cur = conn.execute(
+        """
+        INSERT INTO movements(session_id, kind, amount_cents, total_after_cents, actor_id, created_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        params,
+    )
+    return int(cur.lastrowid)
 
 
 def get_last_movement() -> sqlite3.Row | None:
-    with db() as conn:
+    with read_db() as conn:
         row = conn.execute(
             """
             SELECT id, session_id, kind, amount_cents, total_after_cents, actor_id, created_at
@@ -2182,21 +2591,30 @@ def _kraken_state_snapshot() -> dict:
 
 
 def _format_kraken_amount_4(value: Decimal) -> str:
-    q = value.quantize(Decimal("0.0001"), rounding=ROUND_HALF_UP)
+    q = value.quantize(_DEC_QUANT_4, rounding=ROUND_HALF_UP)
     return f"{q:.4f}"
 
 
-def _kraken_decimal_or_none(value) -> Decimal | None:
-    if value is None:
-        return None
+@functools.lru_cache(maxsize=4096)
+def _parse_kraken_decimal_text(text: str) -> Decimal | None:
+    # Kraken payloads repeat the same amount strings across refreshes; Decimal is immutable.
     try:
-        return Decimal(str(value))
+        return Decimal(text)
     except Exception:
         return None
 
 
+def _kraken_decimal_or_none(value) -> Decimal | None:
+    if value is None:
+        return None
+    if isinstance(value, Decimal):
+        # Cached hold rows already store Decimals; re-parsing str(value) rebuilds the same value.
+        return value
+    return _parse_kraken_decimal_text(str(value))
+
+
 def _format_money_decimal_2(value: Decimal) -> str:
-    return f"{value.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP):.2f}"
+    return f"{value.quantize(_DEC_CENT, rounding=ROUND_HALF_UP):.2f}"
 
 
 def _resolve_release_effective_tradable_usdt(snapshot: dict | None = None) -> tuple[Decimal | None, str]:
@@ -2221,25 +2639,25 @@ def _resolve_release_effective_tradable_usdt(snapshot: dict | None = None) -> tu
 
     effective = resolved - RELEASE_TRADABLE_BUFFER_USDT
     if effective < 0:
-        effective = Decimal("0")
+        effective = _DEC_ZERO
     return effective, source
 
 
 def _compute_release_readiness(total_cents: int, snapshot: dict | None = None) -> dict:
     snap = snapshot or _kraken_state_snapshot()
-    required_usdt = Decimal(max(0, int(total_cents))) / Decimal("100")
+    required_usdt = Decimal(max(0, int(total_cents))) / _DEC_HUNDRED
     available_usdt, source = _resolve_release_effective_tradable_usdt(snap)
     if available_usdt is None:
         return {
             "available_usdt": None,
             "required_usdt": required_usdt,
-            "missing_usdt": Decimal("0"),
+            "missing_usdt": _DEC_ZERO,
             "is_ready": False,
             "source": source,
         }
     missing_usdt = required_usdt - available_usdt
     if missing_usdt < 0:
-        missing_usdt = Decimal("0")
+        missing_usdt = _DEC_ZERO
     return {
         "available_usdt": available_usdt,
         "required_usdt": required_usdt,
@@ -2290,21 +2708,17 @@ def _parse_iso_utc_or_none(s: str | None) -> datetime | None:
 
 def _format_utc_short(dt: datetime) -> str:
     dt_utc = dt.astimezone(timezone.utc)
-    return f"{dt_utc.strftime('%b')} {dt_utc.day} {dt_utc.strftime('%H:%M')} UTC"
+    return f"{_MONTH_ABBR[dt_utc.month]} {dt_utc.day} {dt_utc.hour:02d}:{dt_utc.minute:02d} UTC"
 
 
+@functools.cache
 def _get_kraken_display_tzinfo():
-    global _KRAKEN_DISPLAY_TZINFO, _KRAKEN_DISPLAY_TZ_WARNED
-    if _KRAKEN_DISPLAY_TZINFO is not None:
-        return _KRAKEN_DISPLAY_TZINFO
+    # Resolved (and any fallback warning logged) once per process.
     try:
-        _KRAKEN_DISPLAY_TZINFO = ZoneInfo(KRAKEN_DISPLAY_TZ)
+        return ZoneInfo(KRAKEN_DISPLAY_TZ)
     except Exception:
-        _KRAKEN_DISPLAY_TZINFO = timezone.utc
-        if not _KRAKEN_DISPLAY_TZ_WARNED:
-            _KRAKEN_DISPLAY_TZ_WARNED = True
-            logger.warning("Invalid KRAKEN_DISPLAY_TZ '%s'; falling back to UTC", KRAKEN_DISPLAY_TZ)
-    return _KRAKEN_DISPLAY_TZINFO
+        logger.warning("Invalid KRAKEN_DISPLAY_TZ '%s'; falling back to UTC", KRAKEN_DISPLAY_TZ)
+        return timezone.utc
 
 
 def _format_kraken_display_time_short(dt: datetime) -> str:
@@ -2312,7 +2726,7 @@ def _format_kraken_display_time_short(dt: datetime) -> str:
     hour_12 = local_dt.hour % 12 or 12
     ampm = "AM" if local_dt.hour < 12 else "PM"
     tz_label = local_dt.tzname() or "UTC"
-    return f"{local_dt.strftime('%b')} {local_dt.day} {hour_12}:{local_dt.strftime('%M')} {ampm} {tz_label}"
+    return f"{_MONTH_ABBR[local_dt.month]} {local_dt.day} {hour_12}:{local_dt.minute:02d} {ampm} {tz_label}"
 
 
 def _format_countdown_short(now_dt: datetime, target_dt: datetime) -> str:
@@ -2364,10 +2778,10 @@ def _collect_active_kraken_unlock_rows(
 ) -> tuple[str, list[dict], Decimal]:
     deposit_status = str(snapshot.get("deposit_estimator_status") or "")
     if deposit_status not in {"ok", "stale"}:
-        return deposit_status, [], Decimal("0")
+        return deposit_status, [], _DEC_ZERO
 
     active_rows: list[dict] = []
-    active_total = Decimal("0")
+    active_total = _DEC_ZERO
     for row in (snapshot.get("deposit_hold_rows_usd") or []):
         amount_usd = _kraken_decimal_or_none(row.get("amount_usd"))
         unlock_at = _parse_iso_utc_or_none(row.get("unlock_at_iso"))
@@ -2385,7 +2799,7 @@ def _apply_deposit_hold_bias_usdt(hold_total_usdt: Decimal | None) -> Decimal |
         return None
     adjusted = hold_total_usdt + KRAKEN_DEPOSIT_HOLD_BIAS_USDT
     if adjusted < 0:
-        adjusted = Decimal("0")
+        adjusted = _DEC_ZERO
     return adjusted
 
 
@@ -2409,7 +2823,7 @@ def _compute_hold_estimate_tradable_usdt(
     hold_total_usdt_est = _kraken_decimal_or_none(snapshot.get(hold_total_key))
     if hold_total_usdt_est is None:
         if total_usd <= 0:
-            hold_total_usdt_est = Decimal("0")
+            hold_total_usdt_est = _DEC_ZERO
         elif KRAKEN_DEPOSIT_FX_ENABLED:
             fx_rate = _kraken_decimal_or_none(snapshot.get("usdtusd_rate"))
             if fx_rate is None or fx_rate <= 0:
@@ -2422,7 +2836,7 @@ def _compute_hold_estimate_tradable_usdt(
 
     est_tradable = balance - hold_total_usdt_est
     if est_tradable < 0:
-        est_tradable = Decimal("0")
+        est_tradable = _DEC_ZERO
     if est_tradable > balance:
         est_tradable = balance
     return est_tradable
@@ -2440,15 +2854,15 @@ def _compute_ledger_estimate_tradable_usdt(snapshot: dict) -> Decimal | None:
             return None
         hold_total = sum(
             (
-                _kraken_decimal_or_none(row.get("amount_usdt")) or Decimal("0")
+                _kraken_decimal_or_none(row.get("amount_usdt")) or _DEC_ZERO
                 for row in rows
             ),
-            Decimal("0"),
+            _DEC_ZERO,
         )
 
     est_tradable = balance - hold_total
     if est_tradable < 0:
-        est_tradable = Decimal("0")
+        est_tradable = _DEC_ZERO
     return est_tradable
 
 
@@ -2583,32 +2997,71 @@ def _kraken_sign(url_path: str, nonce: str, postdata: str, api_secret_b64: str)
     return base64.b64encode(sig).decode("utf-8")
 
 
-def _kraken_public_get_sync(url_path: str, params: dict | None = None) -> dict:
-    query = urllib_parse.urlencode({str(k): str(v) for k, v in (params or {}).items() if v is not None})
-    url = f"{KRAKEN_API_BASE}{url_path}"
-    if query:
-        url = f"{url}?{query}"
-
-    req = urllib_request.Request(
-        url=url,
-        headers={
-            "User-Agent": "telegram_bot_zzz/kraken-balance",
-        },
-        method="GET",
-    )
+def _acquire_kraken_http_client() -> httpx.Client:
+    """
+    Shared keep-alive client for Kraken calls; thread-safe, so to_thread workers reuse
+    its pooled TLS connections instead of handshaking on every (paginated) request.
+    Counts the caller as in flight; pair with _release_kraken_http_client().
+    """
+    global _KRAKEN_HTTP_CLIENT, _KRAKEN_HTTP_INFLIGHT
+    with _KRAKEN_HTTP_IDLE:
+        if _KRAKEN_HTTP_CLOSING:
+            raise RuntimeError("Kraken HTTP client is shut down")
+        if _KRAKEN_HTTP_CLIENT is None:
+            _KRAKEN_HTTP_CLIENT = httpx.Client(
+                base_url=KRAKEN_API_BASE,
+                headers={"User-Agent": "telegram_bot_zzz/kraken-balance"},
+                timeout=KRAKEN_TIMEOUT_SECONDS,
+                limits=httpx.Limits(max_connections=4, max_keepalive_connections=4, keepalive_expiry=60),
+                follow_redirects=True,
+            )
+        _KRAKEN_HTTP_INFLIGHT += 1
+        return _KRAKEN_HTTP_CLIENT
+
 
+def _release_kraken_http_client() -> None:
+    global _KRAKEN_HTTP_INFLIGHT
+    with _KRAKEN_HTTP_IDLE:
+        _KRAKEN_HTTP_INFLIGHT -= 1
+        if _KRAKEN_HTTP_INFLIGHT == 0:
+            _KRAKEN_HTTP_IDLE.notify_all()
+
+
+def close_kraken_http_client() -> None:
+    """
+    Refuse new Kraken requests, wait for in-flight ones (cancelled refresh tasks leave their
+    to_thread workers running), then close the shared client.
+    """
+    global _KRAKEN_HTTP_CLIENT, _KRAKEN_HTTP_CLOSING
+    with _KRAKEN_HTTP_IDLE:
+        _KRAKEN_HTTP_CLOSING = True
+        if not _KRAKEN_HTTP_IDLE.wait_for(lambda: _KRAKEN_HTTP_INFLIGHT == 0, timeout=KRAKEN_TIMEOUT_SECONDS + 5):
+            logger.warning("Closing Kraken HTTP client with %s request(s) still in flight", _KRAKEN_HTTP_INFLIGHT)
+        client = _KRAKEN_HTTP_CLIENT
+        _KRAKEN_HTTP_CLIENT = None
+    if client is not None:
+        with contextlib.suppress(Exception):
+            client.close()
+
+
+def _kraken_http_request_sync(method: str, url_path: str, **kwargs) -> str:
+    client = _acquire_kraken_http_client()
     try:
-        with urllib_request.urlopen(req, timeout=KRAKEN_TIMEOUT_SECONDS) as resp:
-            body = resp.read().decode("utf-8")
-    except urllib_error.HTTPError as e:
-        try:
-            body = e.read().decode("utf-8", errors="replace")
-        except Exception:
-            body = ""
+        resp = client.request(method, url_path, **kwargs)
+    except httpx.HTTPError as e:
+        raise RuntimeError(f"Kraken network error: {e}") from e
+    finally:
+        _release_kraken_http_client()
+    body = resp.text
+    if resp.status_code >= 400:
         body_short = body[:200].replace("\n", " ").strip()
-        raise RuntimeError(f"Kraken HTTP {e.code}: {body_short or e.reason}") from e
-    except urllib_error.URLError as e:
-        raise RuntimeError(f"Kraken network error: {e.reason}") from e
+        raise RuntimeError(f"Kraken HTTP {resp.status_code}: {body_short or resp.reason_phrase}")
+    return body
+
+
+def _kraken_public_get_sync(url_path: str, params: dict | None = None) -> dict:
+    query = {str(k): str(v) for k, v in (params or {}).items() if v is not None}
+    body = _kraken_http_request_sync("GET", url_path, params=query)
 
     try:
         payload = json.loads(body)
@@ -2667,39 +3120,28 @@ def _kraken_private_post_sync(url_path: str, extra_form: dict | None = None) ->
     if not KRAKEN_API_KEY or not KRAKEN_API_SECRET:
         raise RuntimeError("Kraken credentials not configured")
 
-    nonce = str(int(time.time() * 1000))
-    form = {"nonce": nonce}
-    for key, value in (extra_form or {}).items():
-        if value is None:
-            continue
-        form[str(key)] = str(value)
-    postdata = urllib_parse.urlencode(form)
-    api_sign = _kraken_sign(url_path, nonce, postdata, KRAKEN_API_SECRET)
-
-    req = urllib_request.Request(
-        url=f"{KRAKEN_API_BASE}{url_path}",
-        data=postdata.encode("utf-8"),
-        headers={
-            "API-Key": KRAKEN_API_KEY,
-            "API-Sign": api_sign,
-            "Content-Type": "application/x-www-form-urlencoded",
-            "User-Agent": "telegram_bot_zzz/kraken-balance",
-        },
-        method="POST",
-    )
-
-    try:
-        with urllib_request.urlopen(req, timeout=KRAKEN_TIMEOUT_SECONDS) as resp:
-            body = resp.read().decode("utf-8")
-    except urllib_error.HTTPError as e:
-        try:
-            body = e.read().decode("utf-8", errors="replace")
-        except Exception:
-            body = ""
-        body_short = body[:200].replace("\n", " ").strip()
-        raise RuntimeError(f"Kraken HTTP {e.code}: {body_short or e.reason}") from e
-    except urllib_error.URLError as e:
-        raise RuntimeError(f"Kraken network error: {e.reason}") from e
+    global _KRAKEN_LAST_NONCE
+    with _KRAKEN_PRIVATE_LOCK:
+        _KRAKEN_LAST_NONCE = max(int(time.time() * 1000), _KRAKEN_LAST_NONCE + 1)
+        nonce = str(_KRAKEN_LAST_NONCE)
+        form = {"nonce": nonce}
+        for key, value in (extra_form or {}).items():
+            if value is None:
+                continue
+            form[str(key)] = str(value)
+        postdata = urllib_parse.urlencode(form)
+        api_sign = _kraken_sign(url_path, nonce, postdata, KRAKEN_API_SECRET)
+
+        body = _kraken_http_request_sync(
+            "POST",
+            url_path,
+            content=postdata.encode("utf-8"),
+            headers={
+                "API-Key": KRAKEN_API_KEY,
+                "API-Sign": api_sign,
+                "Content-Type": "application/x-www-form-urlencoded",
+            },
+        )
 
     try:
         payload = json.loads(body)
@@ -2740,7 +3182,7 @@ def _extract_balance_split_usdt(payload: dict) -> tuple[Decimal, Decimal, Decima
     result = payload.get("result") or {}
     asset = result.get(KRAKEN_ASSET)
     if asset is None:
-        return Decimal("0"), Decimal("0"), Decimal("0")
+        return _DEC_ZERO, _DEC_ZERO, _DEC_ZERO
 
     if isinstance(asset, dict):
         try:
@@ -2768,45 +3210,63 @@ def _extract_balance_split_usdt(payload: dict) -> tuple[Decimal, Decimal, Decima
         tradable = balance
 
     if tradable < 0:
-        tradable = Decimal("0")
+        tradable = _DEC_ZERO
     if balance >= 0 and tradable > balance:
         tradable = balance
 
     locked = balance - tradable
     if locked < 0:
-        locked = Decimal("0")
+        locked = _DEC_ZERO
 
     return balance, tradable, locked
 
 
-def _kraken_parse_time_any(value) -> datetime | None:
-    if value in (None, ""):
-        return None
+# Every string datetime.fromisoformat accepts starts with the 4-digit year.
+_KRAKEN_ISO_PREFIX_RE = re.compile(r"[0-9]{4}")
+
 
+def _kraken_epoch_to_dt(ts: float) -> datetime | None:
     # Numeric epoch timestamps (seconds or milliseconds).
+    if ts > 1e12:
+        ts = ts / 1000.0
     try:
-        if isinstance(value, (int, float)):
-            ts = float(value)
-            if ts > 1e12:
-                ts = ts / 1000.0
-            return datetime.fromtimestamp(ts, tz=timezone.utc)
-        text = str(value).strip()
-        if text and text.replace(".", "", 1).isdigit():
-            ts = float(text)
-            if ts > 1e12:
-                ts = ts / 1000.0
-            return datetime.fromtimestamp(ts, tz=timezone.utc)
-    except Exception:
-        pass
+        return datetime.fromtimestamp(ts, tz=timezone.utc)
+    except (ValueError, OverflowError, OSError):
+        return None
+
 
-    # ISO-ish timestamps.
+@functools.lru_cache(maxsize=4096)
+def _kraken_parse_time_text(raw: str) -> datetime | None:
+    text = raw.strip()
+    # isdigit() alone accepts Unicode digits such as "²" that float() rejects.
+    digits = text.replace(".", "", 1)
+    if digits.isascii() and digits.isdigit():
+        try:
+            dt = _kraken_epoch_to_dt(float(text))
+        except (ValueError, OverflowError):
+            dt = None
+        if dt is not None:
+            return dt
+
+    # ISO-ish timestamps; reject non-dates before paying for a raised ValueError.
+    if not _KRAKEN_ISO_PREFIX_RE.match(raw):
+        return None
     try:
-        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        dt = datetime.fromisoformat(raw.replace("Z", "+00:00"))
         if dt.tzinfo is None:
             dt = dt.replace(tzinfo=timezone.utc)
         return dt.astimezone(timezone.utc)
-    except Exception:
+    except (ValueError, OverflowError, OSError):
+        return None
+
+
+def _kraken_parse_time_any(value) -> datetime | None:
+    if value in (None, ""):
         return None
+    if isinstance(value, (int, float)):
+        return _kraken_epoch_to_dt(float(value))
+    # Pages overlap between refreshes, so the same timestamp strings recur; datetimes are immutable.
+    return _kraken_parse_time_text(str(value))
 
 
 def _kraken_extract_result_items_and_cursor(payload: dict) -> tuple[list, str | None]:
@@ -2871,6 +3331,32 @@ def _kraken_extract_result_items_and_cursor(payload: dict) -> tuple[list, str |
     return items, str(next_cursor) if next_cursor else None
 
 
+# Deposit field aliases, in priority order, hoisted out of the per-item loop.
+_KRAKEN_DEPOSIT_AMOUNT_KEYS = ("amount", "amount_usd", "volume", "vol")
+_KRAKEN_DEPOSIT_TIME_SOURCES = ("processed", "completed", "accepted", "time", "request", "created")
+# Flat (group, key) pairs; the first parseable key of each group wins.
+_KRAKEN_DEPOSIT_TIME_KEYS = (
+    ("processed", "processed_time"),
+    ("processed", "processedAt"),
+    ("processed", "processed_at"),
+    ("completed", "completed_time"),
+    ("completed", "completedAt"),
+    ("completed", "completed_at"),
+    ("accepted", "accepted_time"),
+    ("accepted", "acceptedAt"),
+    ("accepted", "accepted_at"),
+    ("time", "time"),
+    ("request", "request_time"),
+    ("request", "requestAt"),
+    ("request", "request_at"),
+    ("created", "created_time"),
+    ("created", "createdAt"),
+    ("created", "created_at"),
+)
+_KRAKEN_DEPOSIT_STATUS_SKIP_RE = re.compile("fail|error|cancel|reject|denied|pending|initiated")
+_KRAKEN_DEPOSIT_STATUS_DONE_RE = re.compile("success|complete|credited|settled")
+
+
 def _extract_usd_deposit_events(payload: dict) -> tuple[list[dict], str | None]:
     items, next_cursor = _kraken_extract_result_items_and_cursor(payload)
     events: list[dict] = []
@@ -2883,15 +3369,12 @@ def _extract_usd_deposit_events(payload: dict) -> tuple[list[dict], str | None]:
         if asset not in {"USD", "ZUSD"}:
             continue
 
-        amount = _kraken_decimal_or_none(
-            item.get("amount")
-            if item.get("amount") is not None
-            else item.get("amount_usd")
-            if item.get("amount_usd") is not None
-            else item.get("volume")
-            if item.get("volume") is not None
-            else item.get("vol")
-        )
+        raw_amount = None
+        for key in _KRAKEN_DEPOSIT_AMOUNT_KEYS:
+            raw_amount = item.get(key)
+            if raw_amount is not None:
+                break
+        amount = _kraken_decimal_or_none(raw_amount)
         if amount is None or amount <= 0:
             continue
 
@@ -2904,27 +3387,19 @@ def _extract_usd_deposit_events(payload: dict) -> tuple[list[dict], str | None]:
         ).strip()
         status_norm = raw_status.lower()
         if status_norm:
-            if any(x in status_norm for x in ("fail", "error", "cancel", "reject", "denied", "pending", "initiated")):
+            if _KRAKEN_DEPOSIT_STATUS_SKIP_RE.search(status_norm):
                 continue
-            if not any(x in status_norm for x in ("success", "complete", "credited", "settled")):
+            if not _KRAKEN_DEPOSIT_STATUS_DONE_RE.search(status_norm):
                 # Unknown status string; skip to avoid overstating held funds.
                 continue
 
-        time_key_groups = {
-            "processed": ("processed_time", "processedAt", "processed_at"),
-            "completed": ("completed_time", "completedAt", "completed_at"),
-            "accepted": ("accepted_time", "acceptedAt", "accepted_at"),
-            "time": ("time",),
-            "request": ("request_time", "requestAt", "request_at"),
-            "created": ("created_time", "createdAt", "created_at"),
-        }
         candidates: dict[str, datetime] = {}
-        for group_name, keys in time_key_groups.items():
-            for key in keys:
-                parsed = _kraken_parse_time_any(item.get(key))
-                if parsed is not None:
-                    candidates[group_name] = parsed
-                    break
+        for group_name, key in _KRAKEN_DEPOSIT_TIME_KEYS:
+            if group_name in candidates:
+                continue
+            parsed = _kraken_parse_time_any(item.get(key))
+            if parsed is not None:
+                candidates[group_name] = parsed
 
         processed_at = None
         processed_at_source = None
@@ -2932,7 +3407,7 @@ def _extract_usd_deposit_events(payload: dict) -> tuple[list[dict], str | None]:
             processed_at = candidates.get(KRAKEN_DEPOSIT_TIME_ANCHOR)
             processed_at_source = KRAKEN_DEPOSIT_TIME_ANCHOR if processed_at is not None else None
         if processed_at is None:
-            for source_name in ("processed", "completed", "accepted", "time", "request", "created"):
+            for source_name in _KRAKEN_DEPOSIT_TIME_SOURCES:
                 if source_name in candidates:
                     processed_at = candidates[source_name]
                     processed_at_source = source_name
@@ -3006,7 +3481,7 @@ def _estimate_usd_hold_rows_from_deposits(events: list[dict], now_dt: datetime)
         minute_key = dt_to_iso(minute_dt)
         row = rows_by_minute.get(minute_key)
         if row is None:
-            row = {"unlock_at": minute_dt, "amount_usd": Decimal("0")}
+            row = {"unlock_at": minute_dt, "amount_usd": _DEC_ZERO}
             rows_by_minute[minute_key] = row
         row["amount_usd"] += amount_usd
 
@@ -3153,7 +3628,7 @@ def _estimate_unlock_rows_fifo(events: list[dict], now_dt: datetime) -> list[dic
         minute_key = dt_to_iso(minute_dt)
         row = rows_by_minute.get(minute_key)
         if row is None:
-            row = {"unlock_at": minute_dt, "amount_usdt": Decimal("0")}
+            row = {"unlock_at": minute_dt, "amount_usdt": _DEC_ZERO}
             rows_by_minute[minute_key] = row
         row["amount_usdt"] += remaining
 
@@ -3187,7 +3662,7 @@ def _estimate_unlock_rows_timelock(events: list[dict], now_dt: datetime) -> tupl
         minute_key = dt_to_iso(minute_dt)
         row = rows_by_minute.get(minute_key)
         if row is None:
-            row = {"unlock_at": minute_dt, "amount_usdt": Decimal("0")}
+            row = {"unlock_at": minute_dt, "amount_usdt": _DEC_ZERO}
             rows_by_minute[minute_key] = row
         row["amount_usdt"] += amount
 
@@ -3240,8 +3715,36 @@ async def refresh_kraken_cache_once(app: Application) -> None:
         before_block = _format_kraken_dashboard_block(_kraken_state_snapshot(), render_now=refresh_now)
         KRAKEN_CACHE["last_attempt_at"] = now_utc_iso()
 
+        # Run every fetch concurrently (the public ticker overlaps the private calls, which
+        # stay nonce-ordered), then consume results in the original stage order below.
+        deposit_estimator_active = KRAKEN_DEPOSIT_ESTIMATOR_MODE != "off"
+        ledger_shadow_active = KRAKEN_LEDGER_SHADOW_ENABLED or KRAKEN_TRADABLE_MODEL == "ledger_usdt"
+        balance_task = asyncio.create_task(asyncio.to_thread(_kraken_private_post_balance_ex_sync))
+        usdtusd_task = (
+            asyncio.create_task(asyncio.to_thread(_kraken_public_get_ticker_usdtusd_sync))
+            if KRAKEN_DEPOSIT_FX_ENABLED
+            else None
+        )
+        deposit_task = (
+            asyncio.create_task(asyncio.to_thread(_fetch_usd_deposit_events_with_pagination, refresh_now))
+            if deposit_estimator_active
+            else None
+        )
+        ledger_task = (
+            asyncio.create_task(asyncio.to_thread(_fetch_usdt_ledger_events_with_pagination, refresh_now))
+            if ledger_shadow_active
+            else None
+        )
+        # Wait for all of them here so none is left running if a later stage raises; a
+        # cancel (shutdown) propagates into every child. Each stage re-raises its own error
+        # below when it awaits its finished task.
+        await asyncio.gather(
+            *(t for t in (balance_task, usdtusd_task, deposit_task, ledger_task) if t is not None),
+            return_exceptions=True,
+        )
+
         try:
-            payload = await asyncio.to_thread(_kraken_private_post_balance_ex_sync)
+            payload = await balance_task
             balance_usdt, tradable_usdt, locked_usdt = _extract_balance_split_usdt(payload)
         except Exception as e:
             had_success = KRAKEN_CACHE.get("last_success_at_balance") is not None
@@ -3267,7 +3770,7 @@ async def refresh_kraken_cache_once(app: Application) -> None:
                 _format_kraken_amount_4(locked_usdt),
             )
 
-        if not KRAKEN_DEPOSIT_FX_ENABLED:
+        if usdtusd_task is None:
             KRAKEN_CACHE["usdtusd_status"] = "disabled"
             KRAKEN_CACHE["usdtusd_rate"] = None
             KRAKEN_CACHE["usdtusd_pair_used"] = None
@@ -3276,7 +3779,7 @@ async def refresh_kraken_cache_once(app: Application) -> None:
             KRAKEN_CACHE["hold_total_deposit_usdt_est_effective"] = None
         else:
             try:
-                pair_used, usdtusd_rate = await asyncio.to_thread(_kraken_public_get_ticker_usdtusd_sync)
+                pair_used, usdtusd_rate = await usdtusd_task
             except Exception as e:
                 cached_rate = _kraken_decimal_or_none(KRAKEN_CACHE.get("usdtusd_rate"))
                 last_success_raw = KRAKEN_CACHE.get("last_success_at_usdtusd")
@@ -3311,24 +3814,21 @@ async def refresh_kraken_cache_once(app: Application) -> None:
                     _format_kraken_amount_4(usdtusd_rate),
                 )
 
-        if KRAKEN_DEPOSIT_ESTIMATOR_MODE == "off":
+        if deposit_task is None:
             KRAKEN_CACHE["deposit_estimator_status"] = "disabled"
             KRAKEN_CACHE["deposit_hold_rows_usd"] = []
             KRAKEN_CACHE["deposit_hold_total_usd"] = None
             KRAKEN_CACHE["last_error_deposit_status"] = None
         else:
             try:
-                deposit_events, hit_cap = await asyncio.to_thread(
-                    _fetch_usd_deposit_events_with_pagination,
-                    refresh_now,
-                )
+                deposit_events, hit_cap = await deposit_task
                 deposit_hold_rows_usd = _estimate_usd_hold_rows_from_deposits(deposit_events, refresh_now)
                 deposit_hold_total_usd = sum(
                     (
-                        _kraken_decimal_or_none(row.get("amount_usd")) or Decimal("0")
+                        _kraken_decimal_or_none(row.get("amount_usd")) or _DEC_ZERO
                         for row in deposit_hold_rows_usd
                     ),
-                    Decimal("0"),
+                    _DEC_ZERO,
                 )
             except Exception as e:
                 had_success = KRAKEN_CACHE.get("last_success_at_deposit_status") is not None
@@ -3389,7 +3889,7 @@ async def refresh_kraken_cache_once(app: Application) -> None:
         hold_total_deposit_usdt_est: Decimal | None = None
         if deposit_hold_total_usd is not None:
             if deposit_hold_total_usd <= 0:
-                hold_total_deposit_usdt_est = Decimal("0")
+                hold_total_deposit_usdt_est = _DEC_ZERO
             elif KRAKEN_DEPOSIT_FX_ENABLED:
                 fx_rate = _kraken_decimal_or_none(KRAKEN_CACHE.get("usdtusd_rate"))
                 if fx_rate is not None and fx_rate > 0:
@@ -3410,8 +3910,7 @@ async def refresh_kraken_cache_once(app: Application) -> None:
             use_bias=True,
         )
 
-        ledger_shadow_active = KRAKEN_LEDGER_SHADOW_ENABLED or KRAKEN_TRADABLE_MODEL == "ledger_usdt"
-        if not ledger_shadow_active:
+        if ledger_task is None:
             KRAKEN_CACHE["ledger_status"] = "disabled"
             KRAKEN_CACHE["unlock_rows"] = []
             KRAKEN_CACHE["hold_total_ledger_usdt"] = None
@@ -3419,17 +3918,14 @@ async def refresh_kraken_cache_once(app: Application) -> None:
             KRAKEN_CACHE["last_error_ledger"] = None
         else:
             try:
-                ledger_events, hit_cap = await asyncio.to_thread(
-                    _fetch_usdt_ledger_events_with_pagination,
-                    refresh_now,
-                )
+                ledger_events, hit_cap = await ledger_task
                 unlock_rows, positive_events_used = _estimate_unlock_rows_timelock(ledger_events, refresh_now)
                 hold_total_ledger_usdt = sum(
                     (
-                        _kraken_decimal_or_none(row.get("amount_usdt")) or Decimal("0")
+                        _kraken_decimal_or_none(row.get("amount_usdt")) or _DEC_ZERO
                         for row in unlock_rows
                     ),
-                    Decimal("0"),
+                    _DEC_ZERO,
                 )
             except Exception as e:
                 had_success = KRAKEN_CACHE.get("last_success_at_ledger") is not None
@@ -3470,7 +3966,7 @@ async def refresh_kraken_cache_once(app: Application) -> None:
                         len(unlock_rows),
                         _format_kraken_amount_4(hold_total_ledger_usdt),
                         first.get("unlock_at_iso"),
-                        _format_kraken_amount_4(_kraken_decimal_or_none(first.get("amount_usdt")) or Decimal("0")),
+                        _format_kraken_amount_4(_kraken_decimal_or_none(first.get("amount_usdt")) or _DEC_ZERO),
                         KRAKEN_LEDGER_HOLD_ESTIMATE_OFFSET_HOURS,
                         KRAKEN_LEDGER_BURNIN_DAYS,
                         filter_summary,
@@ -3498,7 +3994,7 @@ async def refresh_kraken_cache_once(app: Application) -> None:
             if balance_for_lock is not None:
                 locked_est = balance_for_lock - active_est_tradable
                 if locked_est < 0:
-                    locked_est = Decimal("0")
+                    locked_est = _DEC_ZERO
                 KRAKEN_CACHE["locked_usdt"] = locked_est
 
         if active_est_tradable is not None and api_tradable_for_delta is not None:
@@ -4037,10 +4533,9 @@ async def send_gmail_unknown_sender_alert_for_app(app: Application, parsed: dict
                 f"Asunto: <i>{subject[:180] or 'sin asunto'}</i>"
                 f"{auto_promote_line}"
             ),
-            parse_mode=ParseMode.HTML,
             reply_markup=build_sender_trust_keyboard(sender_trust_id),
         )
-        app.create_task(delete_later_for_app(app, confirmer_id, msg.message_id, NOTIFY_DELETE_SECONDS))
+        schedule_delete(confirmer_id, msg.message_id, NOTIFY_DELETE_SECONDS)
     except Exception:
         logger.warning("Failed to send Gmail unknown-sender alert sender=%s", parsed.get("sender_email"), exc_info=True)
 
@@ -4143,7 +4638,7 @@ async def refresh_gmail_zelle_once(app: Application) -> None:
             continue
 
         async with STATE_LOCK:
-            result = process_gmail_zelle_parsed_tx(parsed, actor_id, effective_mode)
+            result = await asyncio.to_thread(process_gmail_zelle_parsed_tx, parsed, actor_id, effective_mode)
 
         status = str(result.get("status") or "")
         if status == "duplicate":
@@ -4289,8 +4784,33 @@ async def gmail_zelle_poll_loop(app: Application) -> None:
 # UI BUILDERS
 # =========================
 
-def build_panel_text(total_cents: int) -> str:
+@functools.lru_cache(maxsize=256)
+def _panel_totals_block(total_cents: int, pending: int) -> str:
     fee_cents, network_fee_cents, net_cents = compute_fee_net(total_cents)
+    pending_block = ""
+
+    if pending > 0:
+        if pending == 1:
+            pending_block = (
+                "\n危 1 movimiento no confirmado 危\n"
+                "(se autoconfirma en 24h)\n"
+            )
+        else:
+            pending_block = (
+                f"\n危 {pending} movimientos no confirmados 危\n"
+                "(se autoconfirman en 24h)\n"
+            )
+
+    return (
+        f"💰 <b>TOTAL</b> :: <code>${cents_to_money_str(total_cents)}</code>\n"
+        f"<b>費 Fee</b> ({_FEE_PCT_LABEL}) :: <code>${cents_to_money_str(fee_cents)}</code>\n"
+        f"<b>費 Network fee</b> :: <code>${cents_to_money_str(network_fee_cents)}</code>\n"
+        f"💵 <b>NET</b>   :: <code>${cents_to_money_str(net_cents)}</code>\n"
+        f"{pending_block}\n"
+    )
+
+
+def build_panel_text(total_cents: int, snapshot: dict | None = None) -> str:
     kraken_snapshot = _kraken_state_snapshot()
     kraken_block = _format_kraken_dashboard_block(kraken_snapshot)
     readiness = _compute_release_readiness(total_cents, kraken_snapshot)
@@ -4316,45 +4836,38 @@ def build_panel_text(total_cents: int) -> str:
         release_lines.append("<i>Release disponible ahora: -- (estimador no disponible)</i>")
     release_readiness_block = "\n".join(release_lines)
     gmail_footer_block = _format_gmail_footer_status_block()
-    tracking_mode = get_tracking_mode()
+    tracking_mode = snapshot["tracking_mode"] if snapshot is not None else get_tracking_mode()
     footer_lines = [gmail_footer_block]
     if tracking_mode == "manual":
         footer_lines.append(f"<i>⏳ Los mensajes desaparecen en {NOTIFY_DELETE_SECONDS}s</i>")
     gmail_footer_render = "\n\n".join(footer_lines)
 
-    pending = pending_confirmations_count()
-    pending_block = ""
-
-    if pending > 0:
-        if pending == 1:
-            pending_block = (
-                "\n危 1 movimiento no confirmado 危\n"
-                "(se autoconfirma en 24h)\n"
-            )
-        else:
-            pending_block = (
-                f"\n危 {pending} movimientos no confirmados 危\n"
-                "(se autoconfirman en 24h)\n"
-            )
+    pending = snapshot["pending"] if snapshot is not None else pending_confirmations_count()
 
     return (
         f"{kraken_block}\n\n"
         f"{release_readiness_block}\n\n"
         "光 ═════════════ 光\n\n"
-        f"💰 <b>TOTAL</b> :: <code>${cents_to_money_str(total_cents)}</code>\n"
-        f"<b>費 Fee</b> ({(FEE_PCT * 100):.0f}%) :: <code>${cents_to_money_str(fee_cents)}</code>\n"
-        f"<b>費 Network fee</b> :: <code>${cents_to_money_str(network_fee_cents)}</code>\n"
-        f"💵 <b>NET</b>   :: <code>${cents_to_money_str(net_cents)}</code>\n"
-        f"{pending_block}\n"
+        f"{_panel_totals_block(int(total_cents), int(pending))}"
         "光 ═════════════ 光\n"
         f"{gmail_footer_render}"
     )
 
 
-def build_panel_keyboard(viewer_id: int | None = None) -> InlineKeyboardMarkup:
-    tracking_mode = get_tracking_mode()
-    confirmer_id = get_confirmer_id()
+def build_panel_keyboard(viewer_id: int | None = None, snapshot: dict | None = None) -> InlineKeyboardMarkup:
+    if snapshot is not None:
+        tracking_mode = snapshot["tracking_mode"]
+        confirmer_id = snapshot["confirmer_id"]
+    else:
+        tracking_mode = get_tracking_mode()
+        confirmer_id = get_confirmer_id()
     is_admin_viewer = bool(confirmer_id and viewer_id == confirmer_id)
+    return _build_panel_keyboard_variant(tracking_mode, is_admin_viewer)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_panel_keyboard_variant(tracking_mode: str, is_admin_viewer: bool) -> InlineKeyboardMarkup:
+    # Only four layouts exist (mode x admin); markups are immutable, so build each once.
     rows: list[list[InlineKeyboardButton]] = []
     if is_admin_viewer:
         if tracking_mode == "manual":
@@ -4393,14 +4906,16 @@ def _build_subview_control_row() -> list[InlineKeyboardButton]:
     return [InlineKeyboardButton("Volver", callback_data="back")]
 
 
+@functools.lru_cache(maxsize=1)
 def build_back_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup([_build_subview_control_row()])
 
 
 def build_back_to_panel_keyboard() -> InlineKeyboardMarkup:
-    return InlineKeyboardMarkup([_build_subview_control_row()])
+    return build_back_keyboard()
 
 
+@functools.lru_cache(maxsize=1024)
 def build_confirm_keyboard(movement_id: int) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         [[InlineKeyboardButton("✅ Confirm", callback_data=f"confirm:{movement_id}")]]
@@ -4423,6 +4938,7 @@ def build_sender_trust_keyboard(sender_trust_id: int) -> InlineKeyboardMarkup:
     )
 
 
+@functools.lru_cache(maxsize=256)
 def build_senders_list_keyboard(page: int, has_prev: bool, has_next: bool) -> InlineKeyboardMarkup:
     rows: list[list[InlineKeyboardButton]] = []
     nav: list[InlineKeyboardButton] = []
@@ -4436,6 +4952,7 @@ def build_senders_list_keyboard(page: int, has_prev: bool, has_next: bool) -> In
     return InlineKeyboardMarkup(rows)
 
 
+@functools.lru_cache(maxsize=256)
 def build_history_keyboard(page: int, has_prev: bool, has_next: bool) -> InlineKeyboardMarkup:
     rows: list[list[InlineKeyboardButton]] = []
     nav: list[InlineKeyboardButton] = []
@@ -4452,13 +4969,34 @@ def build_history_keyboard(page: int, has_prev: bool, has_next: bool) -> InlineK
 def _load_history_page_rows(session_id: int, page: int) -> tuple[list[sqlite3.Row], bool]:
     page = max(0, page)
     offset = page * HISTORY_PAGE_SIZE
-    with db() as conn:
+    # Date label and payer lookups are resolved by SQLite in the page query itself.
+    with read_db() as conn:
         rows = conn.execute(
             """
-            SELECT id, kind, amount_cents, total_after_cents, actor_id, created_at
-            FROM movements
-            WHERE session_id = ?
-            ORDER BY id DESC
+            SELECT
+                m.id,
+                m.kind,
+                m.amount_cents,
+                m.total_after_cents,
+                m.actor_id,
+                substr(m.created_at, 9, 2) || ' '
+                    || substr('JanFebMarAprMayJunJulAugSepOctNovDec', substr(m.created_at, 6, 2) * 3 - 2, 3) || ' '
+                    || substr(m.created_at, 1, 4) AS date_label,
+                CASE WHEN m.kind = 'add' THEN (
+                    SELECT g.notes
+                    FROM gmail_processed_messages g
+                    WHERE g.status = 'added' AND g.movement_id = m.id
+                    LIMIT 1
+                ) END AS gmail_notes,
+                CASE WHEN m.kind = 'reversal' THEN (
+                    SELECT r.payer_display
+                    FROM gmail_reversals r
+                    WHERE r.reversal_movement_id = m.id
+                    LIMIT 1
+                ) END AS reversal_payer
+            FROM movements m
+            WHERE m.session_id = ?
+            ORDER BY m.id DESC
             LIMIT ? OFFSET ?
             """,
             (session_id, HISTORY_PAGE_SIZE + 1, offset),
@@ -4469,6 +5007,45 @@ def _load_history_page_rows(session_id: int, page: int) -> tuple[list[sqlite3.Ro
     return rows, has_next
 
 
+def _history_gmail_payer(notes: str | None) -> str | None:
+    meta = _json_loads_object_or_none(notes)
+    if not meta:
+        return None
+    payer = str(meta.get("payer_display") or meta.get("identity_display") or "").strip()
+    return payer or None
+
+
+def _format_history_row(r: sqlite3.Row, participant_names: dict[int, str]) -> str:
+    kind = str(r["kind"] or "")
+    amt_cents = int(r["amount_cents"] or 0)
+    total_after_cents = int(r["total_after_cents"] or 0)
+    actor_id = int(r["actor_id"]) if r["actor_id"] is not None else None
+    actor_name = participant_names.get(actor_id or -1)
+    display_name = None
+    if kind == "add":
+        label = "Add"
+        amount_disp = f"${cents_to_money_str(amt_cents)}"
+        display_name = _history_gmail_payer(r["gmail_notes"]) or actor_name
+    elif kind == "release":
+        label = "Release"
+        amount_disp = f"${cents_to_money_str(amt_cents)}"
+        display_name = actor_name
+    elif kind == "reversal":
+        label = "Reversal"
+        amount_disp = f"-${cents_to_money_str(amt_cents)}"
+        display_name = str(r["reversal_payer"] or "").strip() or actor_name
+    else:
+        label = kind
+        amount_disp = f"${cents_to_money_str(amt_cents)}"
+        display_name = actor_name
+    name_suffix = f" &#183; {_html_escape(display_name)}" if display_name else ""
+    return (
+        f"&#183; <b>{_html_escape(label)}{name_suffix}</b>: <code>{amount_disp}</code> "
+        f"&#8594; Total: <code>${cents_to_money_str(total_after_cents)}</code>\n"
+        f"  <i>{r['date_label']}</i>"
+    )
+
+
 def build_history_page_text(page: int) -> tuple[str, bool, bool, int]:
     current_page = max(0, page)
     session_id = int(get_global_state()["session_id"])
@@ -4482,114 +5059,70 @@ def build_history_page_text(page: int) -> tuple[str, bool, bool, int]:
         return "<b>📜 History</b>\n\nNo hay movimientos en esta sesión todavía bro.", has_prev, has_next, current_page
 
     participant_names = get_participant_display_name_map()
-    movement_ids = [int(r["id"]) for r in rows if r["id"] is not None]
-    gmail_payer_by_movement: dict[int, str] = {}
-    reversal_payer_by_movement: dict[int, str] = {}
-    if movement_ids:
-        placeholders = ",".join("?" for _ in movement_ids)
-        with db() as conn:
-            gmail_rows = conn.execute(
-                f"""
-                SELECT movement_id, notes
-                FROM gmail_processed_messages
-                WHERE status = 'added'
-                  AND movement_id IN ({placeholders})
-                """,
-                tuple(movement_ids),
-            ).fetchall()
-            rev_rows = conn.execute(
-                f"""
-                SELECT reversal_movement_id, payer_display
-                FROM gmail_reversals
-                WHERE reversal_movement_id IN ({placeholders})
-                """,
-                tuple(movement_ids),
-            ).fetchall()
-
-        for gr in gmail_rows:
-            if gr["movement_id"] is None:
-                continue
-            meta = _json_loads_object_or_none(gr["notes"])
-            if not meta:
-                continue
-            payer = str(meta.get("payer_display") or meta.get("identity_display") or "").strip()
-            if payer:
-                gmail_payer_by_movement[int(gr["movement_id"])] = payer
-
-        for rr in rev_rows:
-            if rr["reversal_movement_id"] is None:
-                continue
-            payer = str(rr["payer_display"] or "").strip()
-            if payer:
-                reversal_payer_by_movement[int(rr["reversal_movement_id"])] = payer
-
-    months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-    lines = [f"<b>📜 History (sesión actual · página {current_page + 1})</b>", ""]
-    for r in rows:
-        dt_utc = datetime.fromisoformat(r["created_at"])
-        ts = f"{dt_utc.day:02d} {months[dt_utc.month - 1]} {dt_utc.year}"
-
-        movement_id = int(r["id"])
-        kind = str(r["kind"] or "")
-        amt_cents = int(r["amount_cents"] or 0)
-        total_after_cents = int(r["total_after_cents"] or 0)
-        actor_id = int(r["actor_id"]) if r["actor_id"] is not None else None
-        actor_name = participant_names.get(actor_id or -1)
-        display_name = None
-        if kind == "add":
-            label = "Add"
-            amount_disp = f"${cents_to_money_str(amt_cents)}"
-            display_name = gmail_payer_by_movement.get(movement_id) or actor_name
-        elif kind == "release":
-            label = "Release"
-            amount_disp = f"${cents_to_money_str(amt_cents)}"
-            display_name = actor_name
-        elif kind == "reversal":
-            label = "Reversal"
-            amount_disp = f"-${cents_to_money_str(amt_cents)}"
-            display_name = reversal_payer_by_movement.get(movement_id) or actor_name
-        else:
-            label = kind
-            amount_disp = f"${cents_to_money_str(amt_cents)}"
-            display_name = actor_name
-        name_suffix = f" &#183; {_html_escape(display_name)}" if display_name else ""
-        lines.append(
-            f"&#183; <b>{_html_escape(label)}{name_suffix}</b>: <code>{amount_disp}</code> "
-            f"&#8594; Total: <code>${cents_to_money_str(total_after_cents)}</code>\n"
-            f"  <i>{ts}</i>"
-        )
-
-    return "\n".join(lines), has_prev, has_next, current_page
+    text = f"<b>📜 History (sesión actual · página {current_page + 1})</b>\n\n" + "\n".join(
+        _format_history_row(r, participant_names) for r in rows
+    )
+    return text, has_prev, has_next, current_page
 
 
 # =========================
 # DELETE HELPERS / NOTIFY
 # =========================
 
-async def delete_later(context: ContextTypes.DEFAULT_TYPE, chat_id: int, message_id: int, seconds: int):
+def schedule_delete(chat_id: int, message_id: int, seconds: float) -> None:
+    """
+    Queue a best-effort delete; one sweeper task serves every pending deletion.
+    """
+    heapq.heappush(_DELETE_HEAP, (time.monotonic() + seconds, chat_id, message_id))
+    _DELETE_WAKEUP.set()
+
+
+async def try_delete_message(context: ContextTypes.DEFAULT_TYPE, chat_id: int, message_id: int) -> None:
     try:
-        await asyncio.sleep(seconds)
         await context.bot.delete_message(chat_id=chat_id, message_id=message_id)
     except Exception:
         logger.debug(
-            "delete_later failed for chat_id=%s message_id=%s",
+            "failed to delete message chat_id=%s message_id=%s",
             chat_id,
             message_id,
             exc_info=True,
         )
 
 
-async def delete_later_for_app(app: Application, chat_id: int, message_id: int, seconds: int):
+async def _sweep_delete_message(app: Application, chat_id: int, message_id: int) -> None:
+    async with BROADCAST_SEMAPHORE:
+        try:
+            await app.bot.delete_message(chat_id=chat_id, message_id=message_id)
+        except Exception:
+            logger.debug(
+                "scheduled delete failed for chat_id=%s message_id=%s",
+                chat_id,
+                message_id,
+                exc_info=True,
+            )
+
+
+async def delete_sweeper_loop(app: Application) -> None:
     try:
-        await asyncio.sleep(seconds)
-        await app.bot.delete_message(chat_id=chat_id, message_id=message_id)
-    except Exception:
-        logger.debug(
-            "delete_later_for_app failed for chat_id=%s message_id=%s",
-            chat_id,
-            message_id,
-            exc_info=True,
-        )
+        while True:
+            now = time.monotonic()
+            due: list[tuple[int, int]] = []
+            while _DELETE_HEAP and _DELETE_HEAP[0][0] <= now:
+                _, chat_id, message_id = heapq.heappop(_DELETE_HEAP)
+                due.append((chat_id, message_id))
+            if due:
+                await asyncio.gather(*(_sweep_delete_message(app, c, m) for c, m in due))
+                continue
+
+            timeout = _DELETE_HEAP[0][0] - now if _DELETE_HEAP else None
+            _DELETE_WAKEUP.clear()
+            try:
+                await asyncio.wait_for(_DELETE_WAKEUP.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+    except asyncio.CancelledError:
+        logger.info("Delete sweeper loop stopped (%s deletions pending)", len(_DELETE_HEAP))
+        raise
 
 
 def build_gmail_zelle_detected_notification_text(parsed: dict, *, is_new_sender: bool, mode: str) -> str:
@@ -4612,16 +5145,23 @@ def build_gmail_zelle_detected_notification_text(parsed: dict, *, is_new_sender:
     )
 
 
-async def notify_for_app(app: Application, text: str, *, delete_seconds: int | None = None):
-    ttl = NOTIFY_DELETE_SECONDS if delete_seconds is None else max(1, int(delete_seconds))
-    for uid in get_participants():
+async def _notify_participant_for_app(app: Application, uid: int, text: str, ttl: int) -> None:
+    async with BROADCAST_SEMAPHORE:
         try:
-            msg = await app.bot.send_message(chat_id=uid, text=text, parse_mode=ParseMode.HTML)
-            app.create_task(delete_later_for_app(app, uid, msg.message_id, ttl))
+            msg = await app.bot.send_message(chat_id=uid, text=text)
+            schedule_delete(uid, msg.message_id, ttl)
         except Exception:
             logger.warning("notify_for_app failed for participant user_id=%s", uid, exc_info=True)
 
 
+async def notify_for_app(app: Application, text: str, *, delete_seconds: int | None = None):
+    ttl = NOTIFY_DELETE_SECONDS if delete_seconds is None else max(1, int(delete_seconds))
+    await asyncio.gather(
+        *(_notify_participant_for_app(app, uid, text, ttl) for uid in get_participants()),
+        return_exceptions=True,
+    )
+
+
 async def notify(context: ContextTypes.DEFAULT_TYPE, text: str):
     # Best-effort notifications; never crash the bot if notification fails
     await notify_for_app(context.application, text)
@@ -4749,6 +5289,16 @@ def _get_panel_render_lock(chat_id: int) -> asyncio.Lock:
     return lock
 
 
+def _panel_render_signature(
+    message_id: int,
+    mode: str,
+    text: str,
+    reply_markup: InlineKeyboardMarkup | None,
+) -> tuple[int, str, str, str]:
+    markup_json = reply_markup.to_json() if reply_markup is not None else ""
+    return (int(message_id), mode, text, markup_json)
+
+
 def _is_message_missing_error(exc: Exception) -> bool:
     text = str(exc or "").strip().lower()
     if not text:
@@ -4776,10 +5326,10 @@ async def _create_subview_for_app(
         chat_id=chat_id,
         text=text,
         reply_markup=reply_markup,
-        parse_mode=ParseMode.HTML,
         disable_notification=True,
     )
     set_subview_message_id(chat_id, msg.message_id)
+    _LAST_SUBVIEW_RENDER[chat_id] = _panel_render_signature(msg.message_id, "subview", text, reply_markup)
 
 
 async def _render_subview_for_app(
@@ -4789,6 +5339,7 @@ async def _render_subview_for_app(
     reply_markup: InlineKeyboardMarkup,
     *,
     reason: str | None = None,
+    force: bool = False,
 ) -> None:
     started = time.perf_counter()
     render_path = "unknown"
@@ -4797,9 +5348,16 @@ async def _render_subview_for_app(
     async with _get_panel_render_lock(chat_id):
         st = get_chat_state(chat_id)
         subview_message_id = st.get("subview_message_id")
+        render_signature = (
+            _panel_render_signature(subview_message_id, "subview", text, reply_markup)
+            if subview_message_id
+            else None
+        )
         if not subview_message_id:
             await _create_subview_for_app(chat_id, app, text, reply_markup)
             render_path = "subview_create"
+        elif not force and _LAST_SUBVIEW_RENDER.get(chat_id) == render_signature:
+            render_path = "subview_unchanged"
         else:
             try:
                 await app.bot.edit_message_text(
@@ -4807,12 +5365,13 @@ async def _render_subview_for_app(
                     message_id=subview_message_id,
                     text=text,
                     reply_markup=reply_markup,
-                    parse_mode=ParseMode.HTML,
                 )
+                _LAST_SUBVIEW_RENDER[chat_id] = render_signature
                 render_path = "subview_edit"
             except Exception as e:
                 render_error = f"{type(e).__name__}:{str(e)[:120]}"
                 if _is_message_not_modified_error(e):
+                    _LAST_SUBVIEW_RENDER[chat_id] = render_signature
                     render_path = "subview_not_modified"
                 elif _is_message_missing_error(e):
                     set_subview_message_id(chat_id, None)
@@ -4906,9 +5465,10 @@ async def show_subview_for_app(
     reply_markup: InlineKeyboardMarkup,
     *,
     reason: str | None = None,
+    force: bool = False,
 ) -> None:
     if PANEL_SUBVIEW_POLICY == "popup":
-        await _render_subview_for_app(chat_id, app, text, reply_markup, reason=reason)
+        await _render_subview_for_app(chat_id, app, text, reply_markup, reason=reason, force=force)
         return
     await _render_panel_for_app(
         chat_id,
@@ -4917,6 +5477,7 @@ async def show_subview_for_app(
         reply_markup,
         view_mode="text_only",
         reason=reason or "subview_inline",
+        force=force,
     )
 
 
@@ -4928,12 +5489,15 @@ async def show_subview(
     *,
     reason: str | None = None,
 ) -> None:
+    # Button navigation is explicit: re-send even if the cached render matches, in case
+    # the user deleted the subview message.
     await show_subview_for_app(
         chat_id,
         context.application,
         text=text,
         reply_markup=reply_markup,
         reason=reason,
+        force=True,
     )
 
 
@@ -4970,11 +5534,11 @@ async def _create_panel_for_app(
                         photo=banner_photo,
                         caption=text,
                         reply_markup=reply_markup,
-                        parse_mode=ParseMode.HTML,
                         disable_notification=True,
                     )
                     set_panel_mode(chat_id, "banner")
                     set_panel_message_id(chat_id, msg.message_id)
+                    _LAST_PANEL_RENDER[chat_id] = _panel_render_signature(msg.message_id, "banner", text, reply_markup)
                     return
         except Exception:
             logger.warning("Banner panel send failed for chat_id=%s; falling back to text", chat_id, exc_info=True)
@@ -4983,11 +5547,11 @@ async def _create_panel_for_app(
         chat_id=chat_id,
         text=text,
         reply_markup=reply_markup,
-        parse_mode=ParseMode.HTML,
         disable_notification=True,
     )
     set_panel_mode(chat_id, "text")
     set_panel_message_id(chat_id, msg.message_id)
+    _LAST_PANEL_RENDER[chat_id] = _panel_render_signature(msg.message_id, "text", text, reply_markup)
 
 
 async def _render_panel_for_app(
@@ -4998,6 +5562,7 @@ async def _render_panel_for_app(
     *,
     view_mode: str = "dashboard",
     reason: str | None = None,
+    force: bool = False,
 ) -> None:
     started = time.perf_counter()
     target_mode = _resolve_target_panel_mode(view_mode, text)
@@ -5008,6 +5573,11 @@ async def _render_panel_for_app(
         st = get_chat_state(chat_id)
         panel_message_id = st.get("panel_message_id")
         current_mode = st.get("panel_mode", "text")
+        render_signature = (
+            _panel_render_signature(panel_message_id, target_mode, text, reply_markup)
+            if panel_message_id
+            else None
+        )
 
         if not panel_message_id:
             await _create_panel_for_app(
@@ -5058,6 +5628,10 @@ async def _render_panel_for_app(
                 render_path = f"recreate_{target_mode}_mode_switch_missing"
             else:
                 render_path = f"skip_recreate_{target_mode}_delete_fail"
+        elif not force and _LAST_PANEL_RENDER.get(chat_id) == render_signature:
+            # Background refreshes only; forced (user-initiated) renders still hit Telegram so a
+            # panel the user deleted gets recreated via the message-missing path.
+            render_path = f"{target_mode}_unchanged"
         elif target_mode == "banner":
             try:
                 await app.bot.edit_message_caption(
@@ -5065,12 +5639,13 @@ async def _render_panel_for_app(
                     message_id=panel_message_id,
                     caption=text,
                     reply_markup=reply_markup,
-                    parse_mode=ParseMode.HTML,
                 )
+                _LAST_PANEL_RENDER[chat_id] = render_signature
                 render_path = "banner_edit"
             except Exception as e:
                 render_error = f"{type(e).__name__}:{str(e)[:120]}"
                 if _is_message_not_modified_error(e):
+                    _LAST_PANEL_RENDER[chat_id] = render_signature
                     render_path = "banner_not_modified"
                 elif _is_message_missing_error(e):
                     set_panel_message_id(chat_id, None)
@@ -5082,6 +5657,9 @@ async def _render_panel_for_app(
                         target_mode=target_mode,
                     )
                     render_path = "recreate_banner_edit_missing"
+                elif not isinstance(e, BadRequest):
+                    # Timeouts and flood waits are transient; delete+recreate would only add round-trips.
+                    render_path = "banner_edit_transient_fail"
                 else:
                     deleted_old_panel = False
                     try:
@@ -5113,12 +5691,13 @@ async def _render_panel_for_app(
                     message_id=panel_message_id,
                     text=text,
                     reply_markup=reply_markup,
-                    parse_mode=ParseMode.HTML,
                 )
+                _LAST_PANEL_RENDER[chat_id] = render_signature
                 render_path = "text_edit"
             except Exception as e:
                 render_error = f"{type(e).__name__}:{str(e)[:120]}"
                 if _is_message_not_modified_error(e):
+                    _LAST_PANEL_RENDER[chat_id] = render_signature
                     render_path = "text_not_modified"
                 elif _is_message_missing_error(e):
                     set_panel_message_id(chat_id, None)
@@ -5130,6 +5709,9 @@ async def _render_panel_for_app(
                         target_mode=target_mode,
                     )
                     render_path = "recreate_text_edit_missing"
+                elif not isinstance(e, BadRequest):
+                    # Timeouts and flood waits are transient; delete+recreate would only add round-trips.
+                    render_path = "text_edit_transient_fail"
                 else:
                     deleted_old_panel = False
                     try:
@@ -5160,6 +5742,7 @@ async def _render_panel_for_app(
         elapsed_ms >= PANEL_RENDER_SLOW_LOG_MS
         or render_path.startswith("recreate_")
         or render_path.startswith("skip_recreate_")
+        or render_path.endswith("_transient_fail")
     ):
         logger.info(
             "Panel render chat_id=%s view_mode=%s target_mode=%s policy=%s path=%s elapsed_ms=%.1f reason=%s err=%s",
@@ -5212,11 +5795,20 @@ async def edit_panel(
     )
 
 
-async def send_or_update_panel_for_app(chat_id: int, app: Application, *, reason: str | None = None):
-    g = get_global_state()
-    total_cents = g["total_cents"]
-    text = build_panel_text(total_cents)
-    kb = build_panel_keyboard(chat_id)
+async def send_or_update_panel_for_app(
+    chat_id: int,
+    app: Application,
+    *,
+    reason: str | None = None,
+    snapshot: dict | None = None,
+    text: str | None = None,
+    force: bool = False,
+):
+    if snapshot is None:
+        snapshot = await asyncio.to_thread(get_panel_snapshot)
+    if text is None:
+        text = build_panel_text(snapshot["total_cents"], snapshot)
+    kb = build_panel_keyboard(chat_id, snapshot)
     await _render_panel_for_app(
         chat_id,
         app,
@@ -5224,24 +5816,61 @@ async def send_or_update_panel_for_app(chat_id: int, app: Application, *, reason
         kb,
         view_mode="dashboard",
         reason=reason or "panel_sync",
+        force=force,
     )
 
 
 async def send_or_update_panel(chat_id: int, context: ContextTypes.DEFAULT_TYPE):
-    await send_or_update_panel_for_app(chat_id, context.application, reason="panel_sync")
+    # /start and back-to-panel are explicit: never trust the unchanged-render cache here.
+    await send_or_update_panel_for_app(chat_id, context.application, reason="panel_sync", force=True)
 
 
-async def update_all_panels_for_app(app: Application, exclude_chat_id: int | None = None):
-    # Update or create exactly one panel per participant
-    for uid in get_participants():
-        if exclude_chat_id is not None and uid == exclude_chat_id:
-            continue
+async def _update_participant_panel_for_app(uid: int, app: Application, snapshot: dict, text: str) -> None:
+    async with BROADCAST_SEMAPHORE:
         try:
-            await send_or_update_panel_for_app(uid, app, reason="bulk_sync")
+            await send_or_update_panel_for_app(uid, app, reason="bulk_sync", snapshot=snapshot, text=text)
         except Exception:
             logger.warning("panel update failed for user_id=%s", uid, exc_info=True)
 
 
+async def _refresh_panels_for_app(app: Application, uids: tuple[int, ...]) -> None:
+    # The dashboard text is viewer-independent: read and render it once, then fan out.
+    snapshot = await asyncio.to_thread(get_panel_snapshot)
+    text = build_panel_text(snapshot["total_cents"], snapshot)
+    # Update or create exactly one panel per participant, concurrently
+    await asyncio.gather(
+        *(_update_participant_panel_for_app(uid, app, snapshot, text) for uid in uids),
+        return_exceptions=True,
+    )
+
+
+async def _panel_refresh_flush_loop(app: Application) -> None:
+    # Keep draining until no request arrived during the last render.
+    while _PANEL_REFRESH_PENDING:
+        await asyncio.sleep(PANEL_REFRESH_DEBOUNCE_MS / 1000)
+        uids = tuple(_PANEL_REFRESH_PENDING)
+        _PANEL_REFRESH_PENDING.clear()
+        try:
+            await _refresh_panels_for_app(app, uids)
+        except Exception:
+            logger.warning("debounced panel refresh failed", exc_info=True)
+
+
+async def update_all_panels_for_app(app: Application, exclude_chat_id: int | None = None):
+    """
+    Schedule a dashboard refresh for every participant. Bursts of state changes
+    inside PANEL_REFRESH_DEBOUNCE_MS collapse into one edit per chat.
+    """
+    global _PANEL_REFRESH_TASK
+    uids = [uid for uid in get_participants() if exclude_chat_id is None or uid != exclude_chat_id]
+    if PANEL_REFRESH_DEBOUNCE_MS <= 0:
+        await _refresh_panels_for_app(app, tuple(uids))
+        return
+    _PANEL_REFRESH_PENDING.update(uids)
+    if _PANEL_REFRESH_TASK is None or _PANEL_REFRESH_TASK.done():
+        _PANEL_REFRESH_TASK = app.create_task(_panel_refresh_flush_loop(app))
+
+
 async def update_all_panels(context: ContextTypes.DEFAULT_TYPE, exclude_chat_id: int | None = None):
     await update_all_panels_for_app(context.application, exclude_chat_id=exclude_chat_id)
 
@@ -5270,12 +5899,11 @@ async def send_confirmation_request_to_confirmer(
                 "<i>Se autoconfirma en 24h si no respondes.</i>"
             ),
             reply_markup=build_confirm_keyboard(movement_id),
-            parse_mode=ParseMode.HTML,
         )
         set_confirm_message_refs(movement_id, confirmer_id, msg.message_id)
 
         # best-effort delete at 24h (also cleaned on interactions)
-        context.application.create_task(delete_later(context, confirmer_id, msg.message_id, CONFIRM_WINDOW_SECONDS))
+        schedule_delete(confirmer_id, msg.message_id, CONFIRM_WINDOW_SECONDS)
     except Exception:
         logger.warning(
             "failed to send confirmation request movement_id=%s confirmer_id=%s actor_id=%s",
@@ -5286,13 +5914,25 @@ async def send_confirmation_request_to_confirmer(
         )
 
 
+async def send_confirmed_notice_to_actor(context: ContextTypes.DEFAULT_TYPE, actor_id: int, amount_cents: int):
+    try:
+        msg = await context.bot.send_message(
+            chat_id=actor_id,
+            text=(
+                "<b>Confirmado</b>\n"
+                f"Blasco confirmo: <code>${cents_to_money_str(amount_cents)}</code>"
+            ),
+        )
+        schedule_delete(actor_id, msg.message_id, NOTIFY_DELETE_SECONDS)
+    except Exception:
+        pass
+
+
 # =========================
 # UNDO
 # =========================
 
 async def _undo_last_legacy(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    await cleanup_expired_confirmations(context)
-
     last = get_last_movement()
     if not last:
         await notify(context, f"{_tracker_brand_title_html()}\nNo hay nada que deshacer lol.")
@@ -5317,7 +5957,9 @@ async def _undo_last_legacy(update: Update, context: ContextTypes.DEFAULT_TYPE):
             new_total = 0
 
         # Remove confirmation first (and its message)
-        await try_delete_confirm_message(context, last_id)
+        conf = get_confirmation(last_id)
+        if conf:
+            await try_delete_confirm_message(context, conf["confirm_chat_id"], conf["confirm_message_id"])
         delete_confirmation(last_id)
 
         set_global_total(new_total)
@@ -5364,10 +6006,8 @@ async def _undo_last_legacy(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 # Transactional undo implementation (overrides legacy helper above).
 async def undo_last(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    await cleanup_expired_confirmations(context)
-
     async with STATE_LOCK:
-        result = undo_last_movement_tx()
+        result = await asyncio.to_thread(undo_last_movement_tx)
 
     if not result:
         await notify(context, f"{_tracker_brand_title_html()}\nNo hay nada que deshacer lol.")
@@ -5376,27 +6016,22 @@ async def undo_last(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if result["kind"] == "add":
         chat_id = result.get("confirm_chat_id")
         msg_id = result.get("confirm_message_id")
-        if chat_id and msg_id:
-            try:
-                await context.bot.delete_message(chat_id=chat_id, message_id=msg_id)
-            except Exception:
-                logger.debug(
-                    "failed to delete confirmation message chat_id=%s message_id=%s",
-                    chat_id,
-                    msg_id,
-                    exc_info=True,
-                )
-
-        await notify(
-            context,
-            (
-                f"{_tracker_brand_title_html()}\n"
-                "<b>⏪ Control + Z</b>\n"
-                f"Se deshizo: <code>${cents_to_money_str(int(result['amount_cents']))}</code>\n"
-                f"Total: <code>${cents_to_money_str(int(result['new_total_cents']))}</code>"
+        # Removing the stale confirmation request overlaps the notification instead of preceding it.
+        pending = [
+            notify(
+                context,
+                (
+                    f"{_tracker_brand_title_html()}\n"
+                    "<b>⏪ Control + Z</b>\n"
+                    f"Se deshizo: <code>${cents_to_money_str(int(result['amount_cents']))}</code>\n"
+                    f"Total: <code>${cents_to_money_str(int(result['new_total_cents']))}</code>"
+                ),
             ),
-        )
-        await update_all_panels(context)
+            update_all_panels(context),
+        ]
+        if chat_id and msg_id:
+            pending.append(try_delete_message(context, chat_id, msg_id))
+        await asyncio.gather(*pending)
         return
 
     if result["kind"] == "release":
@@ -5438,12 +6073,10 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not user or not chat:
         return
 
-    await cleanup_expired_confirmations(context)
-
     ok = add_participant(user.id, user.first_name, user.username)
     if not ok:
         msg = await chat.send_message("Este tracker ya está completo (máximo 2 usuarios).")
-        context.application.create_task(delete_later(context, chat.id, msg.message_id, 10))
+        schedule_delete(chat.id, msg.message_id, 10)
         return
 
     # Fast path: render this chat immediately, then fan out in background.
@@ -5461,6 +6094,10 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
 # =========================
 
 
+# Callback actions (text before the first ":") whose branch depends on the tracking mode.
+_TRACKING_MODE_CALLBACK_ACTIONS = frozenset({"add", "custom", "undo"})
+
+
 async def on_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     started = time.perf_counter()
@@ -5479,9 +6116,11 @@ async def on_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
         if not user or not is_participant(user.id):
             return
 
-        await cleanup_expired_confirmations(context)
-
-        tracking_mode = get_tracking_mode()
+        # Only the add/custom/undo branches read the mode; skip the lookup for every other button.
+        action = data.partition(":")[0]
+        tracking_mode = (
+            await asyncio.to_thread(get_tracking_mode) if action in _TRACKING_MODE_CALLBACK_ACTIONS else None
+        )
 
         if data in {"close_subview", "back_main"}:
             hint_message_id = query.message.message_id if (query and query.message) else None
@@ -5505,12 +6144,13 @@ async def on_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 return
 
             async with STATE_LOCK:
-                mode_result = set_tracking_mode_tx(target_mode, user.id)
+                mode_result = await asyncio.to_thread(set_tracking_mode_tx, target_mode, user.id)
 
             new_mode = str(mode_result.get("mode") or target_mode)
             GMAIL_ZELLE_STATUS["tracking_mode"] = new_mode
             if new_mode == "auto":
-                AWAITING_CUSTOM_AMOUNT.clear()
+                for user_data in context.application.user_data.values():
+                    user_data.pop(AWAITING_CUSTOM_AMOUNT_KEY, None)
 
             await update_all_panels(context)
 
@@ -5532,32 +6172,33 @@ async def on_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
             add_cents = money_to_cents(add_amount)
 
             async with STATE_LOCK:
-                movement_id, total_cents = add_amount_with_confirmation(user.id, add_cents)
+                movement_id, total_cents = await asyncio.to_thread(add_amount_with_confirmation, user.id, add_cents)
 
-            await notify(
-                context,
-                (
-                    f"{_tracker_brand_title_html()}\n"
-                    f"Se agrego: <code>${cents_to_money_str(add_cents)}</code>\n"
-                    f"Total: <code>${cents_to_money_str(total_cents)}</code>"
+            # Independent Telegram calls: fan out so the add waits on the slowest, not the sum.
+            await asyncio.gather(
+                notify(
+                    context,
+                    (
+                        f"{_tracker_brand_title_html()}\n"
+                        f"Se agrego: <code>${cents_to_money_str(add_cents)}</code>\n"
+                        f"Total: <code>${cents_to_money_str(total_cents)}</code>"
+                    ),
                 ),
+                send_confirmation_request_to_confirmer(
+                    context=context,
+                    movement_id=movement_id,
+                    amount_cents=add_cents,
+                    actor_id=user.id,
+                ),
+                update_all_panels(context),
             )
-
-            await send_confirmation_request_to_confirmer(
-                context=context,
-                movement_id=movement_id,
-                amount_cents=add_cents,
-                actor_id=user.id,
-            )
-
-            await update_all_panels(context)
             return
 
         if data == "custom":
             if tracking_mode != "manual":
-                AWAITING_CUSTOM_AMOUNT.discard(user.id)
+                context.user_data.pop(AWAITING_CUSTOM_AMOUNT_KEY, None)
                 return
-            AWAITING_CUSTOM_AMOUNT.add(user.id)
+            context.user_data[AWAITING_CUSTOM_AMOUNT_KEY] = time.monotonic() + CUSTOM_AMOUNT_PROMPT_TIMEOUT_SECONDS
 
             await show_subview(
                 update.effective_chat.id,
@@ -5574,7 +6215,7 @@ async def on_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
         if data == "senders":
             page = 0
-            list_text, has_prev, has_next = build_senders_list_text(page=page, viewer_id=user.id)
+            list_text, has_prev, has_next = await asyncio.to_thread(build_senders_list_text, page, user.id)
             await show_subview(
                 update.effective_chat.id,
                 context,
@@ -5599,7 +6240,7 @@ async def on_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 page = max(0, int(data.split(":", 2)[2]))
             except Exception:
                 page = 0
-            list_text, has_prev, has_next = build_senders_list_text(page=page, viewer_id=user.id)
+            list_text, has_prev, has_next = await asyncio.to_thread(build_senders_list_text, page, user.id)
             await show_subview(
                 update.effective_chat.id,
                 context,
@@ -5614,7 +6255,7 @@ async def on_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
             if not confirmer_id or user.id != confirmer_id:
                 return
             page = 0
-            list_text, rows, has_prev, has_next = build_admin_reverse_list_text(page=page, viewer_id=user.id)
+            list_text, rows, has_prev, has_next = await asyncio.to_thread(build_admin_reverse_list_text, page, user.id)
             await show_subview(
                 update.effective_chat.id,
                 context,
@@ -5632,7 +6273,7 @@ async def on_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 page = max(0, int(data.split(":", 2)[2]))
             except Exception:
                 page = 0
-            list_text, rows, has_prev, has_next = build_admin_reverse_list_text(page=page, viewer_id=user.id)
+            list_text, rows, has_prev, has_next = await asyncio.to_thread(build_admin_reverse_list_text, page, user.id)
             await show_subview(
                 update.effective_chat.id,
                 context,
@@ -5647,7 +6288,7 @@ async def on_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
             if not confirmer_id or user.id != confirmer_id:
                 return
             gmail_message_id = data.split(":", 2)[2].strip()
-            event = get_recent_gmail_auto_added_event_by_message_id(gmail_message_id)
+            event = await asyncio.to_thread(get_recent_gmail_auto_added_event_by_message_id, gmail_message_id)
             if not event:
                 await show_subview(
                     update.effective_chat.id,
@@ -5680,7 +6321,12 @@ async def on_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
             block_payer = action == "block_and_do"
 
             async with STATE_LOCK:
-                reverse_result = admin_reverse_gmail_event_tx(gmail_message_id, user.id, block_payer=block_payer)
+                reverse_result = await asyncio.to_thread(
+                    admin_reverse_gmail_event_tx,
+                    gmail_message_id,
+                    user.id,
+                    block_payer=block_payer,
+                )
 
             status = str(reverse_result.get("status") or "")
             if status == "reversed":
@@ -5706,7 +6352,7 @@ async def on_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
             else:
                 await notify(context, "<b>Admin Reverse</b>\nNo se pudo aplicar la reversa.")
 
-            event = get_recent_gmail_auto_added_event_by_message_id(gmail_message_id)
+            event = await asyncio.to_thread(get_recent_gmail_auto_added_event_by_message_id, gmail_message_id)
             if event:
                 await show_subview(
                     update.effective_chat.id,
@@ -5720,7 +6366,7 @@ async def on_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 )
             else:
                 page = 0
-                list_text, rows, has_prev, has_next = build_admin_reverse_list_text(page=page, viewer_id=user.id)
+                list_text, rows, has_prev, has_next = await asyncio.to_thread(build_admin_reverse_list_text, page, user.id)
                 await show_subview(
                     update.effective_chat.id,
                     context,
@@ -5746,43 +6392,36 @@ async def on_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
             except Exception:
                 return
 
-            async with STATE_LOCK:
-                confirm_result = confirm_movement_tx(movement_id, user.id)
+            # confirm_movement_tx is one BEGIN IMMEDIATE transaction and confirming never touches
+            # the total, so double taps and undo/auto-confirm races resolve in SQLite without
+            # STATE_LOCK: the later tap sees "already_confirmed".
+            confirm_result = await asyncio.to_thread(confirm_movement_tx, movement_id, user.id)
 
             status = confirm_result["status"]
             if status == "missing":
                 try:
-                    await query.edit_message_text("Confirmacion ya no existe.", parse_mode=ParseMode.HTML)
+                    await query.edit_message_text("Confirmacion ya no existe.")
                 except Exception:
                     pass
                 await update_all_panels(context)
                 return
 
+            delete_confirm_msg = try_delete_confirm_message(
+                context,
+                confirm_result["confirm_chat_id"],
+                confirm_result["confirm_message_id"],
+            )
             if status == "already_confirmed":
-                await try_delete_confirm_message(context, movement_id)
-                await update_all_panels(context)
+                await asyncio.gather(delete_confirm_msg, update_all_panels(context))
                 return
 
-            await try_delete_confirm_message(context, movement_id)
-
             amount_cents = int(confirm_result["amount_cents"])
             actor_id = int(confirm_result["actor_id"])
 
+            pending = [delete_confirm_msg, update_all_panels(context)]
             if actor_id != user.id:
-                try:
-                    msg = await context.bot.send_message(
-                        chat_id=actor_id,
-                        text=(
-                            "<b>Confirmado</b>\n"
-                            f"Blasco confirmo: <code>${cents_to_money_str(amount_cents)}</code>"
-                        ),
-                        parse_mode=ParseMode.HTML,
-                    )
-                    context.application.create_task(delete_later(context, actor_id, msg.message_id, NOTIFY_DELETE_SECONDS))
-                except Exception:
-                    pass
-
-            await update_all_panels(context)
+                pending.append(send_confirmed_notice_to_actor(context, actor_id, amount_cents))
+            await asyncio.gather(*pending)
             return
 
         if data.startswith("sendertrust:"):
@@ -5797,7 +6436,7 @@ async def on_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 return
 
             async with STATE_LOCK:
-                trust_result = sendertrust_action_tx(sender_trust_id, action, user.id)
+                trust_result = await asyncio.to_thread(sendertrust_action_tx, sender_trust_id, action, user.id)
 
             status = str(trust_result.get("status") or "")
             if status == "missing":
@@ -5831,7 +6470,7 @@ async def on_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 )
 
             try:
-                await query.edit_message_text(text=text, parse_mode=ParseMode.HTML)
+                await query.edit_message_text(text=text)
             except Exception:
                 pass
             return
@@ -5839,9 +6478,9 @@ async def on_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
         if data == "release":
             guard_error_text = None
             async with STATE_LOCK:
-                g_now = get_global_state()
+                g_now = await asyncio.to_thread(get_global_state)
                 total_cents_requested = int(g_now["total_cents"])
-                required_usdt = Decimal(total_cents_requested) / Decimal(100)
+                required_usdt = Decimal(total_cents_requested) / _DEC_HUNDRED
                 if required_usdt > 0:
                     effective_tradable_usdt, tradable_source = _resolve_release_effective_tradable_usdt()
                     if effective_tradable_usdt is None:
@@ -5857,7 +6496,7 @@ async def on_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
                             f"<i>Fuente: {_html_escape(tradable_source)}</i>"
                         )
 
-                release_info = None if guard_error_text else release_current_total(user.id)
+                release_info = None if guard_error_text else await asyncio.to_thread(release_current_total, user.id)
 
             if guard_error_text:
                 await notify_for_app(
@@ -5895,7 +6534,7 @@ async def on_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 delete_seconds=RELEASE_NOTIFY_DELETE_SECONDS,
             )
 
-            AWAITING_CUSTOM_AMOUNT.discard(user.id)
+            context.user_data.pop(AWAITING_CUSTOM_AMOUNT_KEY, None)
 
             await show_subview(
                 update.effective_chat.id,
@@ -5903,7 +6542,7 @@ async def on_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 text=(
                     "<b>Released</b>\n\n"
                     f"Total: <code>${cents_to_money_str(total_cents)}</code>\n"
-                    f"Fee ({(FEE_PCT*100):.0f}%): <code>${cents_to_money_str(fee_cents)}</code>\n"
+                    f"Fee ({_FEE_PCT_LABEL}): <code>${cents_to_money_str(fee_cents)}</code>\n"
                     f"Network fee: <code>${cents_to_money_str(network_fee_cents)}</code>\n"
                     f"Net: <code>${cents_to_money_str(net_cents)}</code>\n\n"
                     "El total se reinicio a <b>$0.00</b>."
@@ -5952,13 +6591,12 @@ async def on_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
                     reason="back_popup",
                 )
                 return
-            g = get_global_state()
-            total_cents = g["total_cents"]
+            snapshot = await asyncio.to_thread(get_panel_snapshot)
             await edit_panel(
                 update.effective_chat.id,
                 context,
-                text=build_panel_text(total_cents),
-                reply_markup=build_panel_keyboard(update.effective_chat.id),
+                text=build_panel_text(snapshot["total_cents"], snapshot),
+                reply_markup=build_panel_keyboard(update.effective_chat.id, snapshot),
                 view_mode="dashboard",
                 reason="back_to_dashboard",
             )
@@ -5981,65 +6619,70 @@ async def on_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def on_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.effective_user
-    if not user or not is_participant(user.id):
+    # effective_message: edited replies arrive as edited_message, where update.message is None.
+    message = update.effective_message
+    if user is None or message is None:
+        return
+    # Cheap in-memory check first: most text messages are not custom amounts.
+    # Claim the prompt before the first await: with concurrent updates, a second quick
+    # reply from the same user must not also pass this check and add the amount twice.
+    deadline = context.user_data.pop(AWAITING_CUSTOM_AMOUNT_KEY, None)
+    if deadline is None:
+        return
+    if deadline <= time.monotonic():
+        # Prompt went stale; a number typed much later must not become an add.
         return
 
-    await cleanup_expired_confirmations(context)
-
-    if user.id not in AWAITING_CUSTOM_AMOUNT:
+    if not is_participant(user.id):
         return
 
-    if get_tracking_mode() != "manual":
-        AWAITING_CUSTOM_AMOUNT.discard(user.id)
+    if await asyncio.to_thread(get_tracking_mode) != "manual":
         return
 
     chat_id = update.effective_chat.id
-    text = (update.message.text or "").strip()
+    user_message_id = message.message_id
+    text = (message.text or "").strip()
 
     try:
         add_cents = money_to_cents(text)
     except Exception:
+        # Still waiting for a valid amount: re-arm the same prompt window.
+        context.user_data[AWAITING_CUSTOM_AMOUNT_KEY] = deadline
         try:
-            await context.bot.delete_message(chat_id=chat_id, message_id=update.message.message_id)
+            await context.bot.delete_message(chat_id=chat_id, message_id=user_message_id)
         except Exception:
             pass
 
         msg = await update.effective_chat.send_message(
             "Número inválido. Envía algo como <code>420</code> o <code>420.50</code>, sin letras ni símbolos.",
-            parse_mode=ParseMode.HTML,
         )
-        context.application.create_task(delete_later(context, chat_id, msg.message_id, NOTIFY_DELETE_SECONDS))
+        schedule_delete(chat_id, msg.message_id, NOTIFY_DELETE_SECONDS)
         return
 
-    AWAITING_CUSTOM_AMOUNT.discard(user.id)
-
     async with STATE_LOCK:
-        movement_id, total_cents = add_amount_with_confirmation(user.id, add_cents)
+        movement_id, total_cents = await asyncio.to_thread(add_amount_with_confirmation, user.id, add_cents)
 
-    await notify(
-        context,
-        (
-            f"{_tracker_brand_title_html()}\n"
-            f"Se agregó: <code>${cents_to_money_str(add_cents)}</code>\n"
-            f"Total: <code>${cents_to_money_str(total_cents)}</code>"
+    # Independent Telegram calls (the user's message is deleted to prevent spam): fan out
+    # so the add waits on the slowest round-trip, not the sum.
+    await asyncio.gather(
+        notify(
+            context,
+            (
+                f"{_tracker_brand_title_html()}\n"
+                f"Se agregó: <code>${cents_to_money_str(add_cents)}</code>\n"
+                f"Total: <code>${cents_to_money_str(total_cents)}</code>"
+            ),
         ),
+        send_confirmation_request_to_confirmer(
+            context=context,
+            movement_id=movement_id,
+            amount_cents=add_cents,
+            actor_id=user.id,
+        ),
+        try_delete_message(context, chat_id, user_message_id),
+        update_all_panels(context),
     )
 
-    await send_confirmation_request_to_confirmer(
-        context=context,
-        movement_id=movement_id,
-        amount_cents=add_cents,
-        actor_id=user.id,
-    )
-
-    # Delete user's message to prevent spam
-    try:
-        await context.bot.delete_message(chat_id=chat_id, message_id=update.message.message_id)
-    except Exception:
-        pass
-
-    await update_all_panels(context)
-
 
 # =========================
 # MAIN
@@ -6059,7 +6702,7 @@ async def on_error(update: object, context: ContextTypes.DEFAULT_TYPE):
 
 
 async def on_app_init(app: Application):
-    global KRAKEN_REFRESH_TASK, GMAIL_ZELLE_TASK
+    global KRAKEN_REFRESH_TASK, GMAIL_ZELLE_TASK, CONFIRM_CLEANUP_TASK, DELETE_SWEEPER_TASK
 
     _maybe_warn_banner_source_setup()
     _, banner_source_kind = _resolve_banner_photo_source()
@@ -6071,6 +6714,11 @@ async def on_app_init(app: Application):
         banner_source_kind,
     )
 
+    if not CONFIRM_CLEANUP_TASK or CONFIRM_CLEANUP_TASK.done():
+        CONFIRM_CLEANUP_TASK = app.create_task(confirmation_cleanup_loop(app))
+    if not DELETE_SWEEPER_TASK or DELETE_SWEEPER_TASK.done():
+        DELETE_SWEEPER_TASK = app.create_task(delete_sweeper_loop(app))
+
     if not KRAKEN_CACHE["enabled"]:
         logger.info("Kraken balance dashboard line enabled in placeholder mode (missing Kraken API creds)")
     elif not KRAKEN_REFRESH_TASK or KRAKEN_REFRESH_TASK.done():
@@ -6092,17 +6740,23 @@ async def on_app_init(app: Application):
 
 
 async def on_app_shutdown(app: Application):
-    global KRAKEN_REFRESH_TASK, GMAIL_ZELLE_TASK
+    global KRAKEN_REFRESH_TASK, GMAIL_ZELLE_TASK, CONFIRM_CLEANUP_TASK, DELETE_SWEEPER_TASK
 
-    tasks = [t for t in (KRAKEN_REFRESH_TASK, GMAIL_ZELLE_TASK) if t]
+    tasks = [t for t in (KRAKEN_REFRESH_TASK, GMAIL_ZELLE_TASK, CONFIRM_CLEANUP_TASK, DELETE_SWEEPER_TASK) if t]
     KRAKEN_REFRESH_TASK = None
     GMAIL_ZELLE_TASK = None
+    CONFIRM_CLEANUP_TASK = None
+    DELETE_SWEEPER_TASK = None
     for task in tasks:
         task.cancel()
     for task in tasks:
         with contextlib.suppress(asyncio.CancelledError):
             await task
 
+    close_db_pool()
+    # Blocks until in-flight Kraken worker threads finish; keep it off the event loop.
+    await asyncio.to_thread(close_kraken_http_client)
+
 
 def main():
     if not BOT_TOKEN:
@@ -6121,6 +6775,18 @@ def main():
     app = (
         Application.builder()
         .token(BOT_TOKEN)
+        # Handlers overlap their Telegram round-trips; mutations stay serialized
+        # by STATE_LOCK and BEGIN IMMEDIATE transactions.
+        .concurrent_updates(True)
+        # Every outgoing text/caption is HTML; set it once instead of per call.
+        .defaults(Defaults(parse_mode=ParseMode.HTML))
+        .rate_limiter(
+            AIORateLimiter(
+                overall_max_rate=TELEGRAM_RATE_OVERALL_PER_SECOND,
+                group_max_rate=TELEGRAM_RATE_GROUP_PER_MINUTE,
+                max_retries=TELEGRAM_RATE_MAX_RETRIES,
+            )
+        )
         .post_init(on_app_init)
         .post_shutdown(on_app_shutdown)
         .build()
@@ -6131,7 +6797,22 @@ def main():
     app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, on_message))
     app.add_error_handler(on_error)
 
-    app.run_polling(allowed_updates=Update.ALL_TYPES)
+    # Only the update types the registered handlers consume; the text MessageHandler
+    # matches effective_message, so it also sees edited custom-amount replies.
+    allowed_updates = [Update.MESSAGE, Update.EDITED_MESSAGE, Update.CALLBACK_QUERY]
+    if WEBHOOK_URL:
+        if "PORT" not in os.environ:
+            logger.warning("WEBHOOK_URL is set but PORT is not; run webhook mode as the web process")
+        app.run_webhook(
+            listen=WEBHOOK_LISTEN,
+            port=WEBHOOK_PORT,
+            url_path=BOT_TOKEN,
+            webhook_url=f"{WEBHOOK_URL}/{BOT_TOKEN}",
+            secret_token=WEBHOOK_SECRET_TOKEN,
+            allowed_updates=allowed_updates,
+        )
+    else:
+        app.run_polling(allowed_updates=allowed_updates)
 
 
 if __name__ == "__main__":